@@ -0,0 +1,44 @@
+-- ============================================================================
+-- Academic Course Assistant System - Course Full-Text Search
+-- Cox School of Business
+-- Version 1.0
+-- Description: FTS5 index over course code, name, description and learning
+--              outcomes for the dashboard's Course Search page, kept in sync
+--              with Courses by triggers. Run after 05_DDL_schema_v1.sql; safe
+--              to run again on an existing database.
+-- ============================================================================
+
+-- External-content FTS5 table: the text stays in Courses, the index uses
+-- rowid = CourseID. Prefix indexes make search-as-you-type prefix queries cheap.
+CREATE VIRTUAL TABLE IF NOT EXISTS CourseSearch USING fts5(
+  CourseCode,
+  CourseName,
+  Description,
+  LearningOutcomes,
+  content='Courses',
+  content_rowid='CourseID',
+  tokenize='unicode61 remove_diacritics 2',
+  prefix='2 3'
+);
+
+-- Keep the index in sync with Courses
+CREATE TRIGGER IF NOT EXISTS trg_Courses_Search_Insert AFTER INSERT ON Courses BEGIN
+  INSERT INTO CourseSearch(rowid, CourseCode, CourseName, Description, LearningOutcomes)
+  VALUES (new.CourseID, new.CourseCode, new.CourseName, new.Description, new.LearningOutcomes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Courses_Search_Delete AFTER DELETE ON Courses BEGIN
+  INSERT INTO CourseSearch(CourseSearch, rowid, CourseCode, CourseName, Description, LearningOutcomes)
+  VALUES ('delete', old.CourseID, old.CourseCode, old.CourseName, old.Description, old.LearningOutcomes);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Courses_Search_Update
+AFTER UPDATE OF CourseCode, CourseName, Description, LearningOutcomes ON Courses BEGIN
+  INSERT INTO CourseSearch(CourseSearch, rowid, CourseCode, CourseName, Description, LearningOutcomes)
+  VALUES ('delete', old.CourseID, old.CourseCode, old.CourseName, old.Description, old.LearningOutcomes);
+  INSERT INTO CourseSearch(rowid, CourseCode, CourseName, Description, LearningOutcomes)
+  VALUES (new.CourseID, new.CourseCode, new.CourseName, new.Description, new.LearningOutcomes);
+END;
+
+-- Index the courses that already exist
+INSERT INTO CourseSearch(CourseSearch) VALUES ('rebuild');
@@ -0,0 +1,181 @@
+-- ============================================================================
+-- Academic Course Assistant System - Materialized Course Statistics
+-- Cox School of Business
+-- Version 1.0
+-- Description: Summary tables behind the dashboard's Home and Statistics
+--              pages, kept current by triggers on Courses and Schedules so
+--              the pages read a handful of rows instead of aggregating the
+--              base tables on every render. Run after 05_DDL_schema_v1.sql;
+--              running it again rebuilds the tables from the base tables.
+-- ============================================================================
+
+-- ============================================================================
+-- SUMMARY TABLES
+-- ============================================================================
+
+-- Courses per department, difficulty level, instruction mode and credit hours.
+-- CourseCount covers every status, ActiveCourseCount only Status = 'Active'.
+CREATE TABLE IF NOT EXISTS CourseStatsByDepartment (
+  DepartmentID INTEGER PRIMARY KEY,
+  CourseCount INTEGER NOT NULL DEFAULT 0,
+  ActiveCourseCount INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS CourseStatsByDifficulty (
+  DifficultyLevelID INTEGER PRIMARY KEY,
+  CourseCount INTEGER NOT NULL DEFAULT 0,
+  ActiveCourseCount INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS CourseStatsByMode (
+  InstructionModeID INTEGER PRIMARY KEY,
+  CourseCount INTEGER NOT NULL DEFAULT 0,
+  ActiveCourseCount INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS CourseStatsByCreditHours (
+  CreditHours DECIMAL(3,1) PRIMARY KEY,
+  CourseCount INTEGER NOT NULL DEFAULT 0,
+  ActiveCourseCount INTEGER NOT NULL DEFAULT 0
+);
+
+-- Sections, enrollment and capacity per semester
+CREATE TABLE IF NOT EXISTS SemesterEnrollment (
+  Semester VARCHAR(20) PRIMARY KEY,
+  SectionCount INTEGER NOT NULL DEFAULT 0,
+  TotalEnrolled INTEGER NOT NULL DEFAULT 0,
+  TotalCapacity INTEGER NOT NULL DEFAULT 0
+);
+
+-- ============================================================================
+-- INITIAL LOAD (also resynchronizes on re-run)
+-- ============================================================================
+
+DELETE FROM CourseStatsByDepartment;
+INSERT INTO CourseStatsByDepartment (DepartmentID, CourseCount, ActiveCourseCount)
+SELECT DepartmentID, COUNT(*), SUM(Status = 'Active') FROM Courses GROUP BY DepartmentID;
+
+DELETE FROM CourseStatsByDifficulty;
+INSERT INTO CourseStatsByDifficulty (DifficultyLevelID, CourseCount, ActiveCourseCount)
+SELECT DifficultyLevelID, COUNT(*), SUM(Status = 'Active') FROM Courses GROUP BY DifficultyLevelID;
+
+DELETE FROM CourseStatsByMode;
+INSERT INTO CourseStatsByMode (InstructionModeID, CourseCount, ActiveCourseCount)
+SELECT InstructionModeID, COUNT(*), SUM(Status = 'Active') FROM Courses GROUP BY InstructionModeID;
+
+DELETE FROM CourseStatsByCreditHours;
+INSERT INTO CourseStatsByCreditHours (CreditHours, CourseCount, ActiveCourseCount)
+SELECT CreditHours, COUNT(*), SUM(Status = 'Active') FROM Courses GROUP BY CreditHours;
+
+DELETE FROM SemesterEnrollment;
+INSERT INTO SemesterEnrollment (Semester, SectionCount, TotalEnrolled, TotalCapacity)
+SELECT Semester, COUNT(*), COALESCE(SUM(CurrentEnrollment), 0), SUM(MaxCapacity) FROM Schedules GROUP BY Semester;
+
+-- ============================================================================
+-- COURSES TRIGGERS
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_Courses_Stats_Insert AFTER INSERT ON Courses BEGIN
+  INSERT INTO CourseStatsByDepartment (DepartmentID, CourseCount, ActiveCourseCount)
+  VALUES (new.DepartmentID, 1, new.Status = 'Active')
+  ON CONFLICT(DepartmentID) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+  INSERT INTO CourseStatsByDifficulty (DifficultyLevelID, CourseCount, ActiveCourseCount)
+  VALUES (new.DifficultyLevelID, 1, new.Status = 'Active')
+  ON CONFLICT(DifficultyLevelID) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+  INSERT INTO CourseStatsByMode (InstructionModeID, CourseCount, ActiveCourseCount)
+  VALUES (new.InstructionModeID, 1, new.Status = 'Active')
+  ON CONFLICT(InstructionModeID) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+  INSERT INTO CourseStatsByCreditHours (CreditHours, CourseCount, ActiveCourseCount)
+  VALUES (new.CreditHours, 1, new.Status = 'Active')
+  ON CONFLICT(CreditHours) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Courses_Stats_Delete AFTER DELETE ON Courses BEGIN
+  UPDATE CourseStatsByDepartment
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE DepartmentID = old.DepartmentID;
+  UPDATE CourseStatsByDifficulty
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE DifficultyLevelID = old.DifficultyLevelID;
+  UPDATE CourseStatsByMode
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE InstructionModeID = old.InstructionModeID;
+  UPDATE CourseStatsByCreditHours
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE CreditHours = old.CreditHours;
+END;
+
+-- An update moves the course from its old groups to its new ones
+CREATE TRIGGER IF NOT EXISTS trg_Courses_Stats_Update
+AFTER UPDATE OF DepartmentID, DifficultyLevelID, InstructionModeID, CreditHours, Status ON Courses BEGIN
+  UPDATE CourseStatsByDepartment
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE DepartmentID = old.DepartmentID;
+  UPDATE CourseStatsByDifficulty
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE DifficultyLevelID = old.DifficultyLevelID;
+  UPDATE CourseStatsByMode
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE InstructionModeID = old.InstructionModeID;
+  UPDATE CourseStatsByCreditHours
+  SET CourseCount = CourseCount - 1, ActiveCourseCount = ActiveCourseCount - (old.Status = 'Active')
+  WHERE CreditHours = old.CreditHours;
+
+  INSERT INTO CourseStatsByDepartment (DepartmentID, CourseCount, ActiveCourseCount)
+  VALUES (new.DepartmentID, 1, new.Status = 'Active')
+  ON CONFLICT(DepartmentID) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+  INSERT INTO CourseStatsByDifficulty (DifficultyLevelID, CourseCount, ActiveCourseCount)
+  VALUES (new.DifficultyLevelID, 1, new.Status = 'Active')
+  ON CONFLICT(DifficultyLevelID) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+  INSERT INTO CourseStatsByMode (InstructionModeID, CourseCount, ActiveCourseCount)
+  VALUES (new.InstructionModeID, 1, new.Status = 'Active')
+  ON CONFLICT(InstructionModeID) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+  INSERT INTO CourseStatsByCreditHours (CreditHours, CourseCount, ActiveCourseCount)
+  VALUES (new.CreditHours, 1, new.Status = 'Active')
+  ON CONFLICT(CreditHours) DO UPDATE SET
+    CourseCount = CourseCount + 1, ActiveCourseCount = ActiveCourseCount + excluded.ActiveCourseCount;
+END;
+
+-- ============================================================================
+-- SCHEDULES TRIGGERS
+-- ============================================================================
+
+CREATE TRIGGER IF NOT EXISTS trg_Schedules_Stats_Insert AFTER INSERT ON Schedules BEGIN
+  INSERT INTO SemesterEnrollment (Semester, SectionCount, TotalEnrolled, TotalCapacity)
+  VALUES (new.Semester, 1, COALESCE(new.CurrentEnrollment, 0), new.MaxCapacity)
+  ON CONFLICT(Semester) DO UPDATE SET
+    SectionCount = SectionCount + 1,
+    TotalEnrolled = TotalEnrolled + excluded.TotalEnrolled,
+    TotalCapacity = TotalCapacity + excluded.TotalCapacity;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Schedules_Stats_Delete AFTER DELETE ON Schedules BEGIN
+  UPDATE SemesterEnrollment
+  SET SectionCount = SectionCount - 1,
+      TotalEnrolled = TotalEnrolled - COALESCE(old.CurrentEnrollment, 0),
+      TotalCapacity = TotalCapacity - old.MaxCapacity
+  WHERE Semester = old.Semester;
+END;
+
+-- Enrollment changes during registration touch a single SemesterEnrollment row
+CREATE TRIGGER IF NOT EXISTS trg_Schedules_Stats_Update
+AFTER UPDATE OF Semester, CurrentEnrollment, MaxCapacity ON Schedules BEGIN
+  UPDATE SemesterEnrollment
+  SET SectionCount = SectionCount - 1,
+      TotalEnrolled = TotalEnrolled - COALESCE(old.CurrentEnrollment, 0),
+      TotalCapacity = TotalCapacity - old.MaxCapacity
+  WHERE Semester = old.Semester;
+  INSERT INTO SemesterEnrollment (Semester, SectionCount, TotalEnrolled, TotalCapacity)
+  VALUES (new.Semester, 1, COALESCE(new.CurrentEnrollment, 0), new.MaxCapacity)
+  ON CONFLICT(Semester) DO UPDATE SET
+    SectionCount = SectionCount + 1,
+    TotalEnrolled = TotalEnrolled + excluded.TotalEnrolled,
+    TotalCapacity = TotalCapacity + excluded.TotalCapacity;
+END;
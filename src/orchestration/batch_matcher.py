@@ -0,0 +1,87 @@
+"""
+Cohort-wide batch mode for the Course Matcher.
+
+Loads the active course catalog once, scores every student in the cohort
+against it as a student-by-course matrix, and writes each student's top k
+(default 12) matched courses to reports/{student_id}/matched_courses.json.
+The cohort is either an explicit list of student IDs or a query such as
+"all Juniors in Finance" (--classification Junior --major Finance).
+"""
+
+import argparse
+import json
+import os
+
+from database_queries import DB_PATH, get_db_connection, get_cohort_student_ids
+from course_features import load_course_features
+from course_matcher import top_matched_courses
+from scoring_engine import TOP_K, CourseScoringEngine
+
+# Students scored per matrix; bounds memory at chunk_size x catalog size per criterion
+DEFAULT_CHUNK_SIZE = 256
+
+
+def load_profiles(student_ids, reports_dir='reports'):
+    """Read profile_output.json for each student; returns (profiles by ID, IDs without a profile)"""
+    profiles = {}
+    missing = []
+    for student_id in student_ids:
+        path = os.path.join(reports_dir, str(student_id), 'profile_output.json')
+        if not os.path.exists(path):
+            missing.append(student_id)
+            continue
+        with open(path, 'r') as f:
+            profiles[student_id] = json.load(f)
+    return profiles, missing
+
+
+def match_cohort(student_profiles, available_courses, engine=None, chunk_size=DEFAULT_CHUNK_SIZE, top_k=TOP_K):
+    """Yield (student_id, matched_courses) for every profile, scoring chunk_size students per matrix"""
+    if engine is None:
+        engine = CourseScoringEngine(available_courses)
+    student_ids = list(student_profiles)
+    for start in range(0, len(student_ids), chunk_size):
+        chunk_ids = student_ids[start:start + chunk_size]
+        chunk_profiles = [student_profiles[student_id] for student_id in chunk_ids]
+        scores = engine.score_matrix(chunk_profiles)
+        for row, student_id in enumerate(chunk_ids):
+            yield student_id, top_matched_courses(chunk_profiles[row], engine, engine.top_k(scores[row], top_k))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Match courses for a whole cohort of students in one run")
+    parser.add_argument('student_ids', nargs='*', type=int, help="Student IDs (omit to use --major/--classification)")
+    parser.add_argument('--major', help="Cohort query: major or concentration name, e.g. Finance")
+    parser.add_argument('--classification', help="Cohort query: classification name, e.g. Junior")
+    parser.add_argument('--db', default=DB_PATH, help="Path to sqlite_database.db")
+    parser.add_argument('--reports-dir', default='reports')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--top-k', type=int, default=TOP_K, help="Matched courses kept per student")
+    args = parser.parse_args()
+
+    if not args.student_ids and not (args.major or args.classification):
+        parser.error("give student IDs or a cohort query (--major and/or --classification)")
+
+    conn = get_db_connection(args.db)
+    try:
+        student_ids = args.student_ids or get_cohort_student_ids(conn, args.major, args.classification)
+        features = load_course_features(conn, os.path.join(args.reports_dir, '.cache'))
+    finally:
+        conn.close()
+
+    profiles, missing = load_profiles(student_ids, args.reports_dir)
+    for student_id in missing:
+        print(f"Skipping student {student_id}: no profile_output.json")
+
+    matched_count = 0
+    engine = CourseScoringEngine.from_feature_store(features)
+    cohort_matches = match_cohort(profiles, features.courses, engine, chunk_size=args.chunk_size, top_k=args.top_k)
+    for student_id, matched_courses in cohort_matches:
+        with open(os.path.join(args.reports_dir, str(student_id), 'matched_courses.json'), 'w') as f:
+            json.dump(matched_courses, f, indent=2)
+        matched_count += 1
+
+    print(f"Matched courses for {matched_count} of {len(student_ids)} students")
+
+if __name__ == '__main__':
+    main()
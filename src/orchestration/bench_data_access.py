@@ -0,0 +1,65 @@
+"""
+Micro-benchmark: pd.read_sql_query vs data_access records for small dashboard queries.
+
+Times each query both ways on the same connection and prints per-call
+latency. The SQLite work is identical, so the difference is result
+construction (DataFrame vs named tuples).
+
+Usage: python bench_data_access.py [--db sqlite_database.db] [--repeat 2000]
+"""
+
+import argparse
+import sqlite3
+import timeit
+
+import pandas as pd
+
+from data_access import fetch_all, fetch_one
+
+QUERIES = {
+    "departments (lookup list)": ("""
+        SELECT DISTINCT DepartmentID, DepartmentCode, DepartmentName, DepartmentType
+        FROM Departments
+        WHERE IsActive = 1
+        ORDER BY DepartmentName
+    """, ()),
+    "course details (single row)": ("""
+        SELECT c.CourseID, c.CourseCode, c.CourseName, c.Description, c.CreditHours, c.LearningOutcomes,
+               d.DepartmentName, dl.LevelName as DifficultyLevel
+        FROM Courses c
+        LEFT JOIN Departments d ON c.DepartmentID = d.DepartmentID
+        LEFT JOIN DifficultyLevels dl ON c.DifficultyLevelID = dl.DifficultyLevelID
+        WHERE c.CourseID = (SELECT MIN(CourseID) FROM Courses)
+    """, ()),
+    "browser page (20 rows)": ("""
+        SELECT c.CourseID, c.CourseCode, c.CourseName, c.Description, c.CreditHours, c.MaxEnrollment
+        FROM Courses c
+        WHERE c.Status = 'Active'
+        ORDER BY c.CourseCode
+        LIMIT ? OFFSET ?
+    """, (20, 0)),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare DataFrame and record access paths for small queries")
+    parser.add_argument('--db', default='sqlite_database.db')
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+
+    print(f"{'query':<30} {'pandas (us)':>12} {'records (us)':>13} {'speedup':>8}")
+    for name, (query, params) in QUERIES.items():
+        fetch = fetch_one if "single row" in name else fetch_all
+        pandas_time = min(timeit.repeat(lambda: pd.read_sql_query(query, conn, params=params),
+                                        number=args.repeat, repeat=3)) / args.repeat
+        records_time = min(timeit.repeat(lambda: fetch(conn, query, params),
+                                         number=args.repeat, repeat=3)) / args.repeat
+        print(f"{name:<30} {pandas_time * 1e6:>12.1f} {records_time * 1e6:>13.1f} {pandas_time / records_time:>7.1f}x")
+
+    conn.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,382 @@
+"""
+Shared, versioned snapshot of the course catalog for the per-student scripts.
+
+The active course catalog and prerequisite map are written once per catalog
+version to reports/.catalog/catalog_v{FORMAT}_{version}/ as NumPy columns:
+IDs, credits and difficulty as fixed-width integer arrays, department, level
+and other low-cardinality names as int32 codes into a small category list,
+and free text as an int64 offsets array plus one UTF-8 byte blob. Columns
+with NULLs get a boolean null mask. A reports/{student_id}/ directory can
+hold a small catalog_snapshot.json reference to the snapshot instead of its
+own copy of available_courses.json and prerequisites_map.json. The snapshot
+is for the Python stages; the agent workflow keeps reading the JSON dumps.
+
+The snapshot also holds the matcher's term index (course_index.TermTables):
+the sorted vocabulary as a text column, the postings as offsets plus course
+indices, and the suffix table as (term, start) arrays.
+
+Opened with mmap_mode='r', every array is a read-only memory map, so worker
+processes reading the same snapshot share one copy through the page cache.
+load_snapshot_features() builds a matcher feature store on top of the maps
+without materializing the catalog text or building a term index in each
+process.
+"""
+
+import glob
+import json
+import os
+import shutil
+from collections.abc import Sequence
+
+import numpy as np
+
+from course_features import CourseFeatureStore, get_catalog_version
+from course_index import TermTables, tokenize
+from database_queries import get_available_courses, get_prerequisites_map
+from scoring_engine import course_text
+
+SNAPSHOT_DIR = os.path.join('reports', '.catalog')
+
+# Bump when the on-disk layout or the catalog queries change
+SNAPSHOT_FORMAT = 3
+
+METADATA_FILENAME = 'snapshot.json'
+REFERENCE_FILENAME = 'catalog_snapshot.json'
+
+TABLES = ('available_courses', 'prerequisites_map')
+
+# Derived table: the matcher's lowercased course text, one row per available course
+COURSE_TEXT_TABLE = 'course_text'
+
+# Derived table: the term index vocabulary, one row per term; its other arrays sit beside it
+TERM_TABLE = 'term_index'
+TERM_ARRAYS = ('posting_offsets', 'postings', 'suffix_terms', 'suffix_starts')
+
+# Text columns with few distinct values, stored as int32 codes into a category list
+CATEGORY_COLUMNS = frozenset({'DepartmentName', 'LevelName', 'InstructionMode', 'MinimumGrade', 'PrerequisiteType'})
+
+INT32_RANGE = (np.iinfo(np.int32).min, np.iinfo(np.int32).max)
+
+
+def snapshot_path(version, snapshot_dir=SNAPSHOT_DIR):
+    return os.path.join(snapshot_dir, f'catalog_v{SNAPSHOT_FORMAT}_{version}')
+
+
+def _column_kind(name, values):
+    present = [v for v in values if v is not None]
+    if present and all(isinstance(v, int) and not isinstance(v, bool) for v in present):
+        return 'int'
+    if present and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in present):
+        return 'float'
+    return 'category' if name in CATEGORY_COLUMNS else 'text'
+
+
+def _write_column(directory, table, name, values):
+    """Write one column; returns its metadata entry"""
+    prefix = os.path.join(directory, f'{table}.{name}')
+    kind = _column_kind(name, values)
+    nulls = np.array([v is None for v in values], dtype=bool)
+    spec = {"name": name, "kind": kind, "nullable": bool(nulls.any())}
+    if kind == 'text':
+        encoded = [b'' if v is None else str(v).encode('utf-8') for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        np.save(f'{prefix}.offsets.npy', offsets)
+        np.save(f'{prefix}.blob.npy', np.frombuffer(b''.join(encoded), dtype=np.uint8))
+    elif kind == 'category':
+        categories = list(dict.fromkeys(str(v) for v in values if v is not None))
+        codes = {category: code for code, category in enumerate(categories)}
+        np.save(f'{prefix}.npy', np.array([0 if v is None else codes[str(v)] for v in values], dtype=np.int32))
+        spec["categories"] = categories
+    else:
+        filled = [0 if v is None else v for v in values]
+        if kind == 'float':
+            dtype = np.float64
+        elif not filled or INT32_RANGE[0] <= min(filled) and max(filled) <= INT32_RANGE[1]:
+            dtype = np.int32
+        else:
+            dtype = np.int64
+        np.save(f'{prefix}.npy', np.array(filled, dtype=dtype))
+    if nulls.any():
+        np.save(f'{prefix}.null.npy', nulls)
+    return spec
+
+
+def write_catalog_snapshot(version, available_courses, prerequisites_map, snapshot_dir=SNAPSHOT_DIR):
+    """Write the snapshot for a catalog version unless it already exists; returns its directory"""
+    path = snapshot_path(version, snapshot_dir)
+    if os.path.exists(os.path.join(path, METADATA_FILENAME)):
+        return path
+
+    os.makedirs(snapshot_dir, exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    texts = [course_text(c) for c in available_courses]
+    term_tables = TermTables.build([tokenize(text) for text in texts])
+    tables = {
+        'available_courses': available_courses,
+        'prerequisites_map': prerequisites_map,
+        COURSE_TEXT_TABLE: [{'Text': text} for text in texts],
+        TERM_TABLE: [{'Term': term} for term in term_tables.terms],
+    }
+    metadata = {"format": SNAPSHOT_FORMAT, "version": version, "tables": {}}
+    for table, rows in tables.items():
+        columns = list(rows[0]) if rows else []
+        metadata["tables"][table] = {
+            "rows": len(rows),
+            "columns": [_write_column(tmp_path, table, name, [row[name] for row in rows]) for name in columns],
+        }
+    for name in TERM_ARRAYS:
+        np.save(os.path.join(tmp_path, f'{TERM_TABLE}.{name}.npy'), getattr(term_tables, name))
+    with open(os.path.join(tmp_path, METADATA_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2)
+
+    try:
+        os.rename(tmp_path, path)
+    except OSError:
+        # Another process published this version first; its snapshot is identical
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    prune_catalog_snapshots(path, snapshot_dir)
+    return path
+
+
+def referenced_snapshots(reports_dir):
+    """Absolute paths of the snapshots named by any reports/{student_id}/catalog_snapshot.json"""
+    referenced = set()
+    for reference_path in glob.glob(os.path.join(glob.escape(reports_dir), '*', REFERENCE_FILENAME)):
+        try:
+            with open(reference_path, 'r', encoding='utf-8') as f:
+                reference = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        referenced.add(os.path.abspath(os.path.join(os.path.dirname(reference_path), reference["snapshot"])))
+    return referenced
+
+
+def prune_catalog_snapshots(current_path, snapshot_dir=SNAPSHOT_DIR):
+    """Delete snapshots of older catalog versions that no student directory still references
+
+    Student directories are looked for next to the snapshot directory
+    (reports/.catalog -> reports/*/). Returns the deleted paths.
+    """
+    keep = referenced_snapshots(os.path.dirname(os.path.abspath(snapshot_dir)))
+    keep.add(os.path.abspath(current_path))
+    removed = []
+    for stale_path in glob.glob(os.path.join(glob.escape(snapshot_dir), 'catalog_v*')):
+        # Skip other processes' unpublished .tmp directories and anything still referenced
+        if stale_path.endswith('.tmp') or os.path.abspath(stale_path) in keep:
+            continue
+        shutil.rmtree(stale_path, ignore_errors=True)
+        removed.append(stale_path)
+    return removed
+
+
+def ensure_catalog_snapshot(conn, snapshot_dir=SNAPSHOT_DIR):
+    """Snapshot directory for the database's current catalog version, querying the catalog only if it is new"""
+    version = get_catalog_version(conn)
+    path = snapshot_path(version, snapshot_dir)
+    if os.path.exists(os.path.join(path, METADATA_FILENAME)):
+        return path
+    return write_catalog_snapshot(version, get_available_courses(conn), get_prerequisites_map(conn), snapshot_dir)
+
+
+class TextColumn(Sequence):
+    """Read-only sequence of strings over an offsets array and a UTF-8 blob, decoded on access"""
+
+    def __init__(self, offsets, blob, nulls=None):
+        self.offsets = offsets
+        self.blob = blob
+        self.nulls = nulls
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].tobytes().decode('utf-8')
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class SnapshotRows(Sequence):
+    """Read-only sequence of row dicts over a snapshot table, each row built when accessed"""
+
+    def __init__(self, snapshot, table):
+        self.names = [c["name"] for c in snapshot.tables[table]["columns"]]
+        self.columns = [snapshot.values(table, name) for name in self.names]
+        self.length = snapshot.tables[table]["rows"]
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return {name: column[i] for name, column in zip(self.names, self.columns)}
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class _FixedWidthColumn(Sequence):
+    """Python values from a fixed-width array, optionally through a category list and a null mask"""
+
+    def __init__(self, array, categories=None, nulls=None):
+        self.array = array
+        self.categories = categories
+        self.nulls = nulls
+
+    def __len__(self):
+        return len(self.array)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        if self.nulls is not None and self.nulls[i]:
+            return None
+        value = self.array[i].item()
+        return self.categories[value] if self.categories is not None else value
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class CatalogSnapshot:
+    """Read access to a snapshot directory, column by column or as row dicts
+
+    With mmap_mode='r' the arrays are read-only memory maps of the snapshot
+    files rather than private copies.
+    """
+
+    def __init__(self, path, mmap_mode=None):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        with open(os.path.join(path, METADATA_FILENAME), 'r', encoding='utf-8') as f:
+            metadata = json.load(f)
+        if metadata["format"] != SNAPSHOT_FORMAT:
+            raise ValueError(f"Catalog snapshot {path} has format {metadata['format']}, expected {SNAPSHOT_FORMAT}")
+        self.version = metadata["version"]
+        self.tables = metadata["tables"]
+
+    def _spec(self, table, name):
+        return next(c for c in self.tables[table]["columns"] if c["name"] == name)
+
+    def _load(self, table, name, suffix):
+        return np.load(os.path.join(self.path, f'{table}.{name}.{suffix}'), mmap_mode=self.mmap_mode)
+
+    def array(self, table, name):
+        """The fixed-width array behind an int, float or category (codes) column"""
+        if self._spec(table, name)["kind"] == 'text':
+            raise ValueError(f"{table}.{name} is a text column")
+        return self._load(table, name, 'npy')
+
+    def categories(self, table, name):
+        return self._spec(table, name)["categories"]
+
+    def null_mask(self, table, name):
+        """Boolean NULL mask, or None if the column has no NULLs"""
+        return self._load(table, name, 'null.npy') if self._spec(table, name)["nullable"] else None
+
+    def text(self, table, name):
+        """A text column as a TextColumn over its offsets and blob"""
+        return TextColumn(self._load(table, name, 'offsets.npy'), self._load(table, name, 'blob.npy'),
+                          self.null_mask(table, name))
+
+    def values(self, table, name):
+        """A column as a read-only sequence of Python values, None where NULL, decoded on access"""
+        spec = self._spec(table, name)
+        if spec["kind"] == 'text':
+            return self.text(table, name)
+        return _FixedWidthColumn(self._load(table, name, 'npy'), spec.get("categories"), self.null_mask(table, name))
+
+    def column(self, table, name):
+        """A column as a list of Python values, None where NULL"""
+        spec = self._spec(table, name)
+        if spec["kind"] == 'text':
+            offsets = self._load(table, name, 'offsets.npy').tolist()
+            blob = self._load(table, name, 'blob.npy').tobytes()
+            values = [blob[start:end].decode('utf-8') for start, end in zip(offsets, offsets[1:])]
+        else:
+            values = self._load(table, name, 'npy').tolist()
+            if spec["kind"] == 'category':
+                values = [spec["categories"][code] for code in values]
+        if spec["nullable"]:
+            for i in np.flatnonzero(self._load(table, name, 'null.npy')):
+                values[i] = None
+        return values
+
+    def records(self, table):
+        """Rows as dicts, as the database_queries functions return them"""
+        names = [c["name"] for c in self.tables[table]["columns"]]
+        columns = [self.column(table, name) for name in names]
+        return [dict(zip(names, row)) for row in zip(*columns)]
+
+    def rows(self, table):
+        """Rows as dicts built on access, without materializing the table"""
+        return SnapshotRows(self, table)
+
+    def term_tables(self):
+        """The matcher's term index over the snapshot's arrays"""
+        if self.tables[TERM_TABLE]["rows"]:
+            terms = self.text(TERM_TABLE, 'Term')
+        else:
+            terms = []
+        return TermTables(terms, *(self._load(TERM_TABLE, name, 'npy') for name in TERM_ARRAYS))
+
+    @property
+    def available_courses(self):
+        return self.records('available_courses')
+
+    @property
+    def prerequisites_map(self):
+        return self.records('prerequisites_map')
+
+
+def load_snapshot_features(path):
+    """Matcher feature store over a memory-mapped snapshot.
+
+    Courses, course text and the term index stay in the shared read-only maps
+    and are decoded as they are read; only the derived per-course arrays and
+    the (small) prerequisite map are private to the process.
+    """
+    snapshot = CatalogSnapshot(path, mmap_mode='r')
+    return CourseFeatureStore(snapshot.version, snapshot.rows('available_courses'), snapshot.prerequisites_map,
+                              texts=snapshot.text(COURSE_TEXT_TABLE, 'Text'), term_tables=snapshot.term_tables())
+
+
+def write_snapshot_reference(student_dir, path):
+    """Point a student directory at a snapshot; existing catalog JSON dumps are left in place"""
+    os.makedirs(student_dir, exist_ok=True)
+    snapshot = CatalogSnapshot(path)
+    reference = {
+        "catalog_version": snapshot.version,
+        "snapshot": os.path.relpath(path, student_dir).replace(os.sep, '/'),
+    }
+    with open(os.path.join(student_dir, REFERENCE_FILENAME), 'w', encoding='utf-8') as f:
+        json.dump(reference, f, indent=2)
+    return reference
+
+
+def load_student_catalog(student_dir, table):
+    """One catalog table ('available_courses' or 'prerequisites_map') for a student directory.
+
+    Reads the referenced snapshot, or the legacy per-student {table}.json
+    dump when the directory has no reference.
+    """
+    reference_path = os.path.join(student_dir, REFERENCE_FILENAME)
+    if os.path.exists(reference_path):
+        with open(reference_path, 'r', encoding='utf-8') as f:
+            reference = json.load(f)
+        return CatalogSnapshot(os.path.join(student_dir, reference["snapshot"])).records(table)
+
+    with open(os.path.join(student_dir, f'{table}.json'), 'r') as f:
+        return json.load(f).get(table, [])
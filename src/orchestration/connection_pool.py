@@ -0,0 +1,112 @@
+"""
+Pooled, read-optimized SQLite connections for the Streamlit dashboard.
+
+Connections are opened lazily up to a fixed pool size, tuned once with
+read-side PRAGMAs (WAL, memory-mapped I/O, a larger page cache, query_only),
+and handed to one thread at a time. Each connection keeps its own prepared
+statement cache, so the dashboard's fixed query strings are compiled once per
+connection instead of once per rerun.
+"""
+
+import contextlib
+import queue
+import sqlite3
+import threading
+
+DEFAULT_POOL_SIZE = 4
+# Prepared statements kept per connection (sqlite3 keys them by SQL text)
+STATEMENT_CACHE_SIZE = 256
+
+READ_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456",  # 256 MiB
+    "PRAGMA cache_size = -65536",  # 64 MiB
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA query_only = ON",
+)
+
+
+class ConnectionPool:
+    """Fixed-size pool of read-only SQLite connections shared by every session and thread"""
+
+    def __init__(self, db_path, size=DEFAULT_POOL_SIZE, timeout=30.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._closed = False
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        try:
+            # Readers then never block on the writer; persistent, so it only has to succeed once
+            conn.execute("PRAGMA journal_mode = WAL")
+        except sqlite3.OperationalError:
+            pass  # read-only database file
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def acquire(self):
+        """An idle connection, a new one while under size, otherwise wait for one to be released"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Connection pool is closed")
+            if self._opened < self.size:
+                self._opened += 1
+                open_new = True
+            else:
+                open_new = False
+        if open_new:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No database connection free after {self.timeout}s (pool size {self.size})")
+
+    def release(self, conn):
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._opened -= 1
+        if closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Lease a connection for the duration of a with block"""
+        conn = self.acquire()
+        try:
+            yield conn
+        finally:
+            self.release(conn)
+
+    def close(self):
+        """Close idle connections now; leased ones are closed when released"""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def stats(self):
+        return {"size": self.size, "open": self._opened, "idle": self._idle.qsize()}
@@ -0,0 +1,88 @@
+"""
+Course details bundles for the dashboard's Course Details page.
+
+A bundle holds a course's details row, its prerequisites and its schedule
+sections. Details and sections for any number of courses come back in one
+query (sections aggregated per course with SQLite's JSON functions), and
+prerequisites come from the shared PrerequisiteIndex, so loading the bundles
+for a whole browser or search page is a single round trip.
+"""
+
+import json
+
+from prerequisite_index import load_prerequisite_index
+
+# Course IDs per query, well under SQLite's bound parameter limit
+BUNDLE_BATCH_SIZE = 500
+
+COURSE_BUNDLE_QUERY = """
+SELECT
+    c.CourseID,
+    c.CourseCode,
+    c.CourseName,
+    c.Description,
+    c.CreditHours,
+    c.LearningOutcomes,
+    d.DepartmentName,
+    dl.LevelName as DifficultyLevel,
+    im.ModeName as InstructionMode,
+    c.MaxEnrollment,
+    c.Status,
+    c.SyllabusURL,
+    (SELECT json_group_array(json(section)) FROM (
+        SELECT json_object(
+            'ScheduleID', s.ScheduleID,
+            'Semester', s.Semester,
+            'SectionNumber', s.SectionNumber,
+            'ProfessorName', s.ProfessorName,
+            'MeetingDays', s.MeetingDays,
+            'StartTime', s.StartTime,
+            'EndTime', s.EndTime,
+            'Location', s.Location,
+            'InstructionMode', sim.ModeName,
+            'EnrollmentStatus', s.EnrollmentStatus,
+            'CurrentEnrollment', s.CurrentEnrollment,
+            'MaxCapacity', s.MaxCapacity,
+            'WaitListCount', s.WaitListCount
+        ) as section
+        FROM Schedules s
+        LEFT JOIN InstructionModes sim ON s.InstructionModeID = sim.InstructionModeID
+        WHERE s.CourseID = c.CourseID
+        ORDER BY s.Semester DESC, s.SectionNumber
+    )) as Schedules
+FROM Courses c
+LEFT JOIN Departments d ON c.DepartmentID = d.DepartmentID
+LEFT JOIN DifficultyLevels dl ON c.DifficultyLevelID = dl.DifficultyLevelID
+LEFT JOIN InstructionModes im ON c.InstructionModeID = im.InstructionModeID
+WHERE c.CourseID IN ({placeholders})
+"""
+
+
+class CourseBundle:
+    """A course's details (dict), prerequisite records and schedule sections (lists of dicts)"""
+
+    __slots__ = ('course', 'prerequisites', 'schedules')
+
+    def __init__(self, course, prerequisites, schedules):
+        self.course = course
+        self.prerequisites = prerequisites
+        self.schedules = schedules
+
+
+def load_course_bundles(conn, course_ids, prerequisite_index=None):
+    """{CourseID: CourseBundle} for the given IDs; unknown IDs are left out"""
+    if prerequisite_index is None:
+        prerequisite_index = load_prerequisite_index(conn)
+    course_ids = [int(course_id) for course_id in course_ids]
+
+    bundles = {}
+    for start in range(0, len(course_ids), BUNDLE_BATCH_SIZE):
+        batch = course_ids[start:start + BUNDLE_BATCH_SIZE]
+        cursor = conn.execute(COURSE_BUNDLE_QUERY.format(placeholders=', '.join('?' * len(batch))), batch)
+        columns = [column[0] for column in cursor.description]
+        for row in cursor.fetchall():
+            course = dict(zip(columns, row))
+            schedules = json.loads(course.pop('Schedules') or '[]')
+            bundles[course['CourseID']] = CourseBundle(
+                course, prerequisite_index.for_course_id(course['CourseID']), schedules)
+    return bundles
@@ -0,0 +1,104 @@
+"""
+Precomputed course feature store for the Course Matcher.
+
+Builds per-course features from the Courses, Departments and Prerequisites
+tables once (normalized text, token sets, difficulty order, parsed
+prerequisite IDs, a prerequisite lookup index and the prerequisite graph) and
+caches them on disk keyed by a catalog version, so later runs load them
+directly. The cache rebuilds itself when the catalog changes.
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+
+from course_index import tokenize
+from database_queries import get_available_courses, get_prerequisites_map
+from prerequisite_graph import ORDERING_TYPES, PrerequisiteGraph
+from prerequisite_index import PrerequisiteIndex
+from scoring_engine import course_text
+
+CACHE_DIR = os.path.join('reports', '.cache')
+
+# Bump when CourseFeatureStore or the catalog queries change so older pickles are not reused
+FEATURE_STORE_FORMAT = 5
+
+
+def get_catalog_version(conn):
+    """Version key for the catalog: row counts and latest UpdatedDate of the source tables"""
+    row = conn.execute("""
+    SELECT
+      (SELECT COUNT(*) FROM Courses),
+      (SELECT MAX(UpdatedDate) FROM Courses),
+      (SELECT COUNT(*) FROM Prerequisites),
+      (SELECT MAX(UpdatedDate) FROM Prerequisites),
+      (SELECT COUNT(*) FROM Departments),
+      (SELECT group_concat(DepartmentID || ':' || DepartmentName || ':' || IsActive) FROM Departments)
+    """).fetchone()
+    return hashlib.sha1(repr(tuple(row)).encode('utf-8')).hexdigest()[:16]
+
+
+class CourseFeatureStore:
+    """Catalog records plus the per-course features the matcher derives from them
+
+    courses may be any sequence of course dicts. texts, when given, is the
+    precomputed course text (e.g. a shared catalog_snapshot column); token
+    sets are then left to the scoring engine's index instead of being kept here.
+    term_tables, when given, is a prebuilt course_index.TermTables (e.g. the
+    snapshot's memory-mapped one) for the scoring engine's index to use as is.
+    """
+
+    def __init__(self, version, courses, prerequisites_map, texts=None, term_tables=None):
+        self.version = version
+        self.courses = courses
+        self.prerequisites_map = prerequisites_map
+        # One index over the prerequisite map, shared by the graph and the eligibility engine
+        self.prerequisite_index = PrerequisiteIndex(prerequisites_map)
+        self.prerequisite_graph = PrerequisiteGraph(self.prerequisite_index, ORDERING_TYPES)
+        if texts is None:
+            self.texts = [course_text(c) for c in courses]
+            self.tokens = [tokenize(text) for text in self.texts]
+        else:
+            self.texts = texts
+            self.tokens = None
+        self.term_tables = term_tables
+        self.difficulty = [c.get('DifficultyLevel', 1) for c in courses]
+        self.prerequisite_ids = [
+            tuple(int(p) for p in c['PrerequisiteCourseIDs'].split(',')) if c['PrerequisiteCourseIDs'] else ()
+            for c in courses
+        ]
+
+    def __len__(self):
+        return len(self.courses)
+
+
+def build_course_features(conn, version=None):
+    if version is None:
+        version = get_catalog_version(conn)
+    return CourseFeatureStore(version, get_available_courses(conn), get_prerequisites_map(conn))
+
+
+def load_course_features(conn, cache_dir=CACHE_DIR):
+    """Load the feature store for the current catalog version, building and caching it if needed"""
+    version = get_catalog_version(conn)
+    cache_path = os.path.join(cache_dir, f'course_features_v{FEATURE_STORE_FORMAT}_{version}.pkl')
+    if os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+
+    store = build_course_features(conn, version)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(store, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+    # Older catalog versions are never read again
+    for stale_path in glob.glob(os.path.join(cache_dir, 'course_features_*.pkl')):
+        if stale_path != cache_path:
+            try:
+                os.remove(stale_path)
+            except FileNotFoundError:
+                pass
+    return store
@@ -0,0 +1,159 @@
+"""
+Inverted index over course text for candidate pruning in the Course Matcher.
+
+Maps normalized terms to the courses that contain them so the matcher only
+fully scores courses that hit at least one of a student's keywords or strong
+subject departments. Keyword lookups keep the matcher's substring semantics:
+a keyword made of a single alphanumeric run occurs in a text exactly when it
+occurs inside one of the text's tokens, so it resolves through the token
+vocabulary. Other keywords are narrowed by their parts and then verified
+against the candidate texts. Terms containing a fragment are found by
+binary search over the sorted suffixes of the vocabulary, not a vocabulary
+scan.
+
+The vocabulary, postings and suffix table are flat arrays (TermTables):
+postings as an offsets array into one array of course indices, and each
+suffix as a (term, start) pair instead of its own string. catalog_snapshot
+writes them to disk so worker processes can memory-map one shared copy
+rather than each tokenizing the catalog and building its own.
+"""
+
+import re
+from bisect import bisect_left
+from collections import OrderedDict
+
+import numpy as np
+
+from keyword_matcher import KeywordMatcher
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Keyword postings kept per index, least recently used evicted first
+MAX_KEYWORD_POSTINGS = 1024
+
+
+def tokenize(text):
+    return frozenset(TOKEN_PATTERN.findall(text))
+
+
+class TermTables:
+    """Sorted vocabulary with CSR postings and a suffix table, as flat arrays
+
+    terms: sorted sequence of term strings. postings[posting_offsets[t]:
+    posting_offsets[t + 1]] are the (sorted) courses containing terms[t].
+    suffix_terms and suffix_starts list every suffix terms[t][k:] as (t, k),
+    sorted by the suffix text.
+    """
+
+    def __init__(self, terms, posting_offsets, postings, suffix_terms, suffix_starts):
+        self.terms = terms
+        self.posting_offsets = posting_offsets
+        self.postings = postings
+        self.suffix_terms = suffix_terms
+        self.suffix_starts = suffix_starts
+
+    @classmethod
+    def build(cls, course_tokens):
+        term_postings = {}
+        for i, tokens in enumerate(course_tokens):
+            for term in tokens:
+                term_postings.setdefault(term, []).append(i)
+        terms = sorted(term_postings)
+        posting_offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum([len(term_postings[term]) for term in terms], out=posting_offsets[1:])
+        postings = np.array([i for term in terms for i in term_postings[term]], dtype=np.int32)
+
+        # A term contains a fragment exactly when one of its suffixes starts with it,
+        # so in suffix order the matches are one contiguous range
+        suffixes = sorted(((term[k:], t, k) for t, term in enumerate(terms) for k in range(len(term))))
+        suffix_terms = np.array([t for _, t, _ in suffixes], dtype=np.int32)
+        suffix_starts = np.array([k for _, _, k in suffixes], dtype=np.int32)
+        return cls(terms, posting_offsets, postings, suffix_terms, suffix_starts)
+
+
+class _SuffixKeys:
+    """The suffix strings of a TermTables, in sorted order, decoded when bisect reads them"""
+
+    def __init__(self, tables):
+        self.tables = tables
+
+    def __len__(self):
+        return len(self.tables.suffix_terms)
+
+    def __getitem__(self, i):
+        return self.tables.terms[int(self.tables.suffix_terms[i])][int(self.tables.suffix_starts[i]):]
+
+
+class CourseIndex:
+    """Term -> course postings, plus department and difficulty groupings"""
+
+    def __init__(self, course_texts, course_tokens=None, department_ids=(), difficulty=(), code_rank=(),
+                 term_tables=None):
+        self.course_texts = course_texts
+        if term_tables is None:
+            if course_tokens is None:
+                course_tokens = [tokenize(text) for text in course_texts]
+            term_tables = TermTables.build(course_tokens)
+        self.term_tables = term_tables
+        self._suffix_keys = _SuffixKeys(term_tables)
+
+        department_postings = {}
+        for i, department_id in enumerate(department_ids):
+            department_postings.setdefault(int(department_id), []).append(i)
+        self.department_postings = {d: np.array(p, dtype=np.int64) for d, p in department_postings.items()}
+
+        # Courses per difficulty level in CourseCode order, for floor-score (difficulty-only) ranking
+        difficulty_groups = {}
+        for i in sorted(range(len(difficulty)), key=lambda i: code_rank[i]):
+            difficulty_groups.setdefault(float(difficulty[i]), []).append(i)
+        self.difficulty_groups = difficulty_groups
+
+        self._keyword_postings = OrderedDict()
+
+    def __len__(self):
+        return len(self.course_texts)
+
+    def term_lookup(self, fragment):
+        """Courses with a token containing fragment"""
+        start = bisect_left(self._suffix_keys, fragment)
+        end = bisect_left(self._suffix_keys, fragment + chr(0x10FFFF), start)
+        tables = self.term_tables
+        matched = np.unique(tables.suffix_terms[start:end])
+        # Gather every matched term's postings in one fancy index rather than a slice per term
+        starts = tables.posting_offsets[matched]
+        lengths = tables.posting_offsets[matched + 1] - starts
+        positions = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths) + np.arange(lengths.sum())
+        return np.unique(tables.postings[positions]).astype(np.int64)
+
+    def keyword_postings(self, keyword):
+        """Sorted indices of courses whose text contains the (lowercase) keyword"""
+        postings = self._keyword_postings.get(keyword)
+        if postings is not None:
+            self._keyword_postings.move_to_end(keyword)
+            return postings
+
+        parts = TOKEN_PATTERN.findall(keyword)
+        if len(parts) == 1 and parts[0] == keyword:
+            postings = self.term_lookup(keyword)
+        else:
+            if parts:
+                candidates = self.term_lookup(parts[0])
+                for part in parts[1:]:
+                    candidates = np.intersect1d(candidates, self.term_lookup(part), assume_unique=True)
+            else:
+                candidates = np.arange(len(self), dtype=np.int64)
+            matcher = KeywordMatcher([keyword])
+            postings = np.array([i for i in candidates.tolist() if matcher.find(self.course_texts[i])], dtype=np.int64)
+
+        self._keyword_postings[keyword] = postings
+        if len(self._keyword_postings) > MAX_KEYWORD_POSTINGS:
+            self._keyword_postings.popitem(last=False)
+        return postings
+
+    def candidates(self, keywords, department_ids=()):
+        """Sorted indices of courses hitting any keyword or any of the departments"""
+        postings = [self.keyword_postings(k) for k in keywords]
+        postings += [self.department_postings[d] for d in department_ids if d in self.department_postings]
+        if not postings:
+            return np.zeros(0, dtype=np.int64)
+        return np.unique(np.concatenate(postings))
@@ -1,14 +1,9 @@
 import json
 import sys
 
-student_id = sys.argv[1]
-
-with open(f'reports/{student_id}/profile_output.json', 'r') as f:
-    student_profile = json.load(f)
-
-with open(f'reports/{student_id}/available_courses.json', 'r') as f:
-    available_courses_data = json.load(f)
-    available_courses = available_courses_data.get('available_courses', [])
+from catalog_snapshot import load_student_catalog
+from keyword_matcher import get_keyword_matcher
+from scoring_engine import GENERAL_CAREER_KEYWORDS, TOP_K, CourseScoringEngine
 
 def calculate_relevance_score(course, student_profile):
     score = 0
@@ -17,10 +12,16 @@ def calculate_relevance_score(course, student_profile):
     # 1. Interest Alignment (40% weight)
     interest_keywords = student_profile['interests']
     course_text = (course['CourseName'] + ' ' + course['Description'] + ' ' + course['DepartmentName']).lower()
+    career_keywords = [student_profile['career_goals'].lower()] if student_profile['career_goals'] else []
+    major_keywords = [student_profile['Major'].lower()] if student_profile.get('Major') else []
+
+    # Every keyword this profile can match on, found in one pass over the course text
+    profile_keywords = [i.lower() for i in interest_keywords] + career_keywords + GENERAL_CAREER_KEYWORDS + major_keywords
+    keyword_hits = get_keyword_matcher(tuple(profile_keywords)).find(course_text)
     
     direct_interest_matches = 0
     for interest in interest_keywords:
-        if interest.lower() in course_text:
+        if interest.lower() in keyword_hits:
             direct_interest_matches += 1
             match_reasoning_list.append(f"Aligns with interest in '{interest}'.")
     
@@ -28,15 +29,14 @@ def calculate_relevance_score(course, student_profile):
     score += interest_score * 40
 
     # 2. Career Relevance (30% weight)
-    career_keywords = [student_profile['career_goals'].lower()] if student_profile['career_goals'] else []
     career_relevance = 0
     for keyword in career_keywords:
-        if keyword in course_text:
+        if keyword in keyword_hits:
             career_relevance = 1.0
             match_reasoning_list.append(f"Highly relevant for career goal of '{student_profile['career_goals']}'.")
             break
     
-    if any(k in course_text for k in ["finance", "financial", "investment", "investments", "banking", "corporate", "valuation", "mergers", "acquisitions", "computer science", "programming", "data structures", "algorithms"]):
+    if any(k in keyword_hits for k in GENERAL_CAREER_KEYWORDS):
         if career_relevance == 0:
             career_relevance = 0.7
             match_reasoning_list.append("Contains general keywords relevant to career goals.")
@@ -65,7 +65,7 @@ def calculate_relevance_score(course, student_profile):
     if course['DepartmentName'] in student_profile['strong_subjects']:
         strategic_value_score += 0.6
         match_reasoning_list.append(f"Builds on strong subject '{course['DepartmentName']}'.")
-    if student_profile.get('Major') and student_profile['Major'].lower() in course_text:
+    if major_keywords and major_keywords[0] in keyword_hits:
         strategic_value_score += 0.4
         match_reasoning_list.append(f"Relevant to student's major in '{student_profile['Major']}'.")
     score += strategic_value_score * 10
@@ -74,32 +74,44 @@ def calculate_relevance_score(course, student_profile):
     match_reasoning = " ".join(list(set(match_reasoning_list)))
     return round(final_score, 2), match_reasoning
 
-matched_courses = []
-for course in available_courses:
-    relevance_score, match_reasoning = calculate_relevance_score(course, student_profile)
-    course_copy = course.copy()
-    course_copy['relevance_score'] = relevance_score
-    course_copy['match_reasoning'] = match_reasoning
-    matched_courses.append(course_copy)
-
-matched_courses.sort(key=lambda x: x['relevance_score'], reverse=True)
-
-top_12_matched_courses = matched_courses[:12]
-
-output_courses = []
-for course in top_12_matched_courses:
-    output_courses.append({
-        "course_id": str(course['CourseID']),
-        "course_code": course['CourseCode'],
-        "course_name": course['CourseName'],
-        "description": course['Description'],
-        "department": course['DepartmentName'],
-        "credits": course['CreditHours'],
-        "difficulty_level": course['DifficultyLevel'],
-        "prerequisites": course['PrerequisiteCourseIDs'].split(',') if course['PrerequisiteCourseIDs'] else [],
-        "relevance_score": course['relevance_score'],
-        "match_reasoning": course['match_reasoning']
-    })
-
-with open(f'reports/{student_id}/matched_courses.json', 'w') as f:
-    json.dump(output_courses, f, indent=2)
\ No newline at end of file
+def match_courses(student_profile, available_courses, engine=None, top_k=TOP_K, course_mask=None):
+    if engine is None:
+        engine = CourseScoringEngine(available_courses)
+    return top_matched_courses(student_profile, engine, engine.match_top_k(student_profile, top_k, course_mask))
+
+def top_matched_courses(student_profile, engine, ranked_courses):
+    # Only the top_k survivors, as (course index, score) pairs, get output dicts and match reasoning
+    output_courses = []
+    for i, relevance_score in ranked_courses:
+        course = engine.courses[i]
+        _, match_reasoning = calculate_relevance_score(course, student_profile)
+        output_courses.append({
+            "course_id": str(course['CourseID']),
+            "course_code": course['CourseCode'],
+            "course_name": course['CourseName'],
+            "description": course['Description'],
+            "department": course['DepartmentName'],
+            "credits": course['CreditHours'],
+            "difficulty_level": course['DifficultyLevel'],
+            "prerequisites": [str(p) for p in engine.prerequisite_ids[i]],
+            "relevance_score": relevance_score,
+            "match_reasoning": match_reasoning
+        })
+    return output_courses
+
+def main():
+    student_id = sys.argv[1]
+    top_k = int(sys.argv[2]) if len(sys.argv) > 2 else TOP_K
+
+    with open(f'reports/{student_id}/profile_output.json', 'r') as f:
+        student_profile = json.load(f)
+
+    available_courses = load_student_catalog(f'reports/{student_id}', 'available_courses')
+
+    output_courses = match_courses(student_profile, available_courses, top_k=top_k)
+
+    with open(f'reports/{student_id}/matched_courses.json', 'w') as f:
+        json.dump(output_courses, f, indent=2)
+
+if __name__ == '__main__':
+    main()
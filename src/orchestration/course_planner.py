@@ -0,0 +1,250 @@
+"""
+Multi-term course planner built on the prerequisite graph.
+
+Lays out the courses a student still needs (the target courses plus every
+hard prerequisite not yet satisfied, by the EligibilityEngine rule of a
+grade-qualified completion or an approved waiver) term by term under a
+per-term credit limit. A course goes into a term only when its hard
+prerequisites still being planned are finished in earlier terms and it is
+offered in that term's season according to Schedules; recommended
+prerequisites only order the courses listed within a term. Each
+term is filled greedily along the critical path (longest remaining chain
+first), and a bounded search tries a few alternative fills per term so that
+courses offered only in one season do not push the plan out. The rest of a
+plan depends only on the unfinished courses and the season, so plans are
+memoized and shared across students with the same remaining courses.
+"""
+
+import re
+
+SEASONS = ('Spring', 'Summer', 'Fall')
+PLANNING_SEASONS = ('Spring', 'Fall')
+DEFAULT_START_TERM = ('Fall', 2025)
+MAX_TERM_CREDITS = 15
+DEFAULT_CREDITS = 3
+
+TERM_PATTERN = re.compile(r'(Spring|Summer|Fall)\s*(\d{4})')
+
+
+def parse_term(term):
+    """('Fall', 2025) for 'Fall2025' or 'Fall 2025', None when not recognised"""
+    match = TERM_PATTERN.fullmatch(term.strip()) if term else None
+    return (match.group(1), int(match.group(2))) if match else None
+
+
+def term_label(term):
+    return f"{term[0]} {term[1]}"
+
+
+def term_key(term):
+    return (term[1], SEASONS.index(term[0]))
+
+
+def next_term(term, seasons=PLANNING_SEASONS):
+    """The planning term after term"""
+    season, year = term
+    for later in SEASONS[SEASONS.index(season) + 1:]:
+        if later in seasons:
+            return (later, year)
+    return (min(seasons, key=SEASONS.index), year + 1)
+
+
+class CoursePlanner:
+    """Term-by-term course plans over a PrerequisiteGraph, memoized by remaining courses and season"""
+
+    # Bound on memoized (remaining courses, season, credit limit) plans kept across students
+    MAX_CACHED_PLANS = 100000
+    # Search nodes per plan; past it only the greedy fill of each term is followed
+    SEARCH_BUDGET = 2000
+
+    def __init__(self, prerequisite_graph, eligibility_engine, course_credits=None, offerings=(),
+                 seasons=PLANNING_SEASONS, max_credits=MAX_TERM_CREDITS):
+        self.graph = prerequisite_graph
+        self.eligibility = eligibility_engine
+        self.seasons = tuple(s for s in SEASONS if s in seasons)
+        self.max_credits = max_credits
+        course_credits = course_credits or {}
+
+        # Offered seasons per course, and the latest scheduled term
+        offered_seasons = {}
+        self.latest_offering = None
+        for code, semester in offerings:
+            term = parse_term(semester)
+            if term is None:
+                continue
+            if self.latest_offering is None or term_key(term) > term_key(self.latest_offering):
+                self.latest_offering = term
+            if term[0] in self.seasons:
+                offered_seasons.setdefault(code, set()).add(self.seasons.index(term[0]))
+
+        # The graph's topological order (hard and recommended edges) first, then every other course
+        self.order = list(prerequisite_graph.order)
+        self.order += sorted((set(course_credits) | set(offered_seasons)) - set(self.order))
+        self.position = {code: i for i, code in enumerate(self.order)}
+
+        # Only hard prerequisites constrain the plan; edges the graph dropped to break a cycle stay dropped
+        dropped = set(prerequisite_graph.dropped_edges)
+        self.direct = [
+            self.bitset(p['PrerequisiteCourseCode'] for p in eligibility_engine.hard_requirements(code)
+                        if (code, p['PrerequisiteCourseCode']) not in dropped)
+            for code in self.order
+        ]
+        self.dependents = [0] * len(self.order)
+        for i, prereq_bits in enumerate(self.direct):
+            for j in self._indices(prereq_bits):
+                self.dependents[j] |= 1 << i
+
+        # Courses without a scheduled section in a planning season are assumed to run every term
+        every_season = frozenset(range(len(self.seasons)))
+        self.offered = [frozenset(offered_seasons.get(code, every_season)) for code in self.order]
+        self.credits = [int(float(course_credits.get(code) or DEFAULT_CREDITS)) for code in self.order]
+
+        self._plans = {}
+        self._budget = 0
+        self._heights = {}
+
+    @classmethod
+    def from_catalog(cls, prerequisite_graph, eligibility_engine, available_courses, offerings,
+                     max_credits=MAX_TERM_CREDITS):
+        """Planner with catalog credit hours and the get_course_offerings rows (CourseCode, Semester)"""
+        return cls(prerequisite_graph, eligibility_engine,
+                   {c['CourseCode']: c['CreditHours'] for c in available_courses},
+                   [(o['CourseCode'], o['Semester']) for o in offerings],
+                   max_credits=max_credits)
+
+    @staticmethod
+    def _indices(bits):
+        indices = []
+        while bits:
+            low = bits & -bits
+            indices.append(low.bit_length() - 1)
+            bits ^= low
+        return indices
+
+    def bitset(self, course_codes):
+        bits = 0
+        for code in course_codes:
+            if code in self.position:
+                bits |= 1 << self.position[code]
+        return bits
+
+    def start_term(self, academic_history=()):
+        """First term to plan: after the student's last completed term, and no earlier than the latest schedule"""
+        candidates = []
+        completed_terms = [t for t in (parse_term(r.get('TermCompleted')) for r in academic_history) if t]
+        if completed_terms:
+            candidates.append(next_term(max(completed_terms, key=term_key), self.seasons))
+        if self.latest_offering is not None:
+            term = self.latest_offering
+            candidates.append(term if term[0] in self.seasons else next_term(term, self.seasons))
+        if not candidates:
+            return DEFAULT_START_TERM
+        return max(candidates, key=term_key)
+
+    def required_bits(self, academic_history, target_course_codes, waivers=()):
+        """Targets not yet taken, plus the hard prerequisites EligibilityEngine reports missing for them"""
+        completed_course_codes = {r['CourseCode'] for r in academic_history}
+        required = 0
+        for code in target_course_codes:
+            if code in completed_course_codes or code not in self.position:
+                continue
+            required |= 1 << self.position[code]
+            required |= self.bitset(self.eligibility.missing_prerequisites(code, academic_history, waivers))
+        return required
+
+    def plan(self, academic_history, target_course_codes, start_term, waivers=(), max_credits=None):
+        """Terms from start_term on, as {"term", "courses", "credits"}, until every target can be taken
+
+        Every prerequisite EligibilityEngine.missing_prerequisites reports for
+        a target is scheduled before it. A waived requirement whose prerequisite
+        is still planned for another target keeps ordering the two. Courses in
+        a term are listed prerequisites first. A term with nothing offered is
+        kept (with no courses) so the term labels stay consecutive.
+        """
+        if max_credits is None:
+            max_credits = self.max_credits
+        if start_term[0] not in self.seasons:
+            start_term = next_term(start_term, self.seasons)
+
+        required = self.required_bits(academic_history, target_course_codes, waivers)
+        self._budget = self.SEARCH_BUDGET
+        self._heights = self.chain_heights(required)
+        fills = self._search(required, self.seasons.index(start_term[0]), max_credits)
+
+        terms = []
+        term = start_term
+        for fill in fills:
+            indices = self._indices(fill)
+            terms.append({
+                "term": term_label(term),
+                "courses": [self.order[i] for i in indices],
+                "credits": sum(self.credits[i] for i in indices),
+            })
+            term = next_term(term, self.seasons)
+        return terms
+
+    def _search(self, remaining, season, max_credits):
+        # Shortest plan (a tuple of per-term bitsets) among the candidate fills tried at each term
+        if not remaining:
+            return ()
+        key = (remaining, season, max_credits)
+        plan = self._plans.get(key)
+        if plan is not None:
+            return plan
+
+        self._budget -= 1
+        following = (season + 1) % len(self.seasons)
+        for n, fill in enumerate(self._term_fills(remaining, season, max_credits)):
+            if n and self._budget <= 0:
+                break
+            rest = self._search(remaining & ~fill, following, max_credits)
+            if plan is None or len(rest) + 1 < len(plan):
+                plan = (fill,) + rest
+
+        if len(self._plans) >= self.MAX_CACHED_PLANS:
+            self._plans.clear()
+        self._plans[key] = plan
+        return plan
+
+    def chain_heights(self, required):
+        """Length of the longest chain of required courses starting at each required course
+
+        Every required dependent of an unfinished course is unfinished too, so
+        the heights hold for any remaining subset of required along the plan.
+        """
+        heights = {}
+        for i in reversed(self._indices(required)):
+            dependents = self.dependents[i] & required
+            heights[i] = 1 + max((heights[j] for j in self._indices(dependents)), default=0)
+        return heights
+
+    def _term_fills(self, remaining, season, max_credits):
+        """Distinct ways to fill one term, the critical-path greedy fill first"""
+        available = [i for i in self._indices(remaining)
+                     if not self.direct[i] & remaining and season in self.offered[i]]
+        if not available:
+            return [0]
+
+        heights = self._heights
+        orderings = (
+            sorted(available, key=lambda i: (-heights[i], len(self.offered[i]), i)),
+            # Courses offered in fewer seasons first, so they are not missed until next year
+            sorted(available, key=lambda i: (len(self.offered[i]), -heights[i], i)),
+            sorted(available, key=lambda i: (-self.credits[i], -heights[i], i)),
+        )
+        fills = []
+        for ordering in orderings:
+            fill, credits = 0, 0
+            for i in ordering:
+                # A course over the credit limit still gets a term of its own
+                if credits + self.credits[i] <= max_credits or not fill:
+                    fill |= 1 << i
+                    credits += self.credits[i]
+            if fill not in fills:
+                fills.append(fill)
+        return fills
+
+
+def course_terms(course_plan):
+    """Course code -> planned term label"""
+    return {code: term["term"] for term in course_plan for code in term["courses"]}
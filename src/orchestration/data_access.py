@@ -0,0 +1,48 @@
+"""
+Thin row access path for small dashboard queries.
+
+Returns rows as named tuples (tuple subclasses with empty __slots__, field
+access by column name) built straight from the cursor. For lookup lists and
+single-row lookups this skips the DataFrame construction that
+pd.read_sql_query does. That construction costs far more than the SQLite
+query itself at these sizes. Use pandas only where a DataFrame is really
+needed (charts, st.dataframe).
+"""
+
+from collections import namedtuple
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def record_type(columns):
+    """Named tuple type for a result's column names, created once per distinct column list"""
+    return namedtuple('Record', columns, rename=True)
+
+
+def _execute(conn, query, params):
+    cursor = conn.cursor()
+    cursor.row_factory = None  # plain tuples, whatever the connection's row_factory
+    cursor.execute(query, params)
+    return cursor
+
+
+def fetch_all(conn, query, params=()):
+    """Every row as a record"""
+    cursor = _execute(conn, query, params)
+    make = record_type(tuple(column[0] for column in cursor.description))._make
+    return [make(row) for row in cursor.fetchall()]
+
+
+def fetch_one(conn, query, params=()):
+    """The first row as a record, or None"""
+    cursor = _execute(conn, query, params)
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    return record_type(tuple(column[0] for column in cursor.description))._make(row)
+
+
+def fetch_value(conn, query, params=()):
+    """First column of the first row, or None"""
+    row = _execute(conn, query, params).fetchone()
+    return row[0] if row is not None else None
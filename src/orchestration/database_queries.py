@@ -1,11 +1,14 @@
 
-import sys
+import argparse
+import os
 import sqlite3
 import json
 import datetime
 
-def get_db_connection():
-    conn = sqlite3.connect(r'c:\Users\macgl\Projects\ai_group_project\sqlite_database.db')
+DB_PATH = r'c:\Users\macgl\Projects\ai_group_project\sqlite_database.db'
+
+def get_db_connection(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -15,13 +18,7 @@ def execute_query(conn, query, params=()):
     rows = cursor.fetchall()
     return [dict(row) for row in rows]
 
-def main():
-    if len(sys.argv) < 2:
-        print("Usage: python database_queries.py <student_id>")
-        sys.exit(1)
-    student_id = int(sys.argv[1])
-    conn = get_db_connection()
-
+def get_student_profile(conn, student_id):
     # Query 1: Student Profile Data
     profile_query = """
     SELECT 
@@ -34,9 +31,9 @@ def main():
     LEFT JOIN Classification c ON s.ClassificationID = c.ClassificationID
     WHERE s.StudentID = ?
     """
-    profile_data = execute_query(conn, profile_query, (student_id,))
-    print(json.dumps({"student_profile": profile_data}))
+    return execute_query(conn, profile_query, (student_id,))
 
+def get_academic_history(conn, student_id):
     # Query 2: Student Academic History
     history_query = """
     SELECT 
@@ -53,9 +50,9 @@ def main():
     WHERE ah.StudentID = ?
     ORDER BY ah.TermCompleted DESC
     """
-    history_data = execute_query(conn, history_query, (student_id,))
-    print(json.dumps({"academic_history": history_data}))
+    return execute_query(conn, history_query, (student_id,))
 
+def get_available_courses(conn):
     # Query 3: All Active Courses
     courses_query = """
     SELECT 
@@ -78,14 +75,15 @@ def main():
     GROUP BY c.CourseID
     ORDER BY c.CourseCode
     """
-    courses_data = execute_query(conn, courses_query)
-    print(json.dumps({"available_courses": courses_data}))
+    return execute_query(conn, courses_query)
 
+def get_prerequisites_map(conn):
     # Query 4: Prerequisites Map
     prereqs_query = """
     SELECT 
       c.CourseID,
       c.CourseCode,
+      p.PrerequisiteID,
       p.PrerequisiteCourseID,
       pc.CourseCode as PrerequisiteCourseCode,
       p.MinimumGrade,
@@ -96,8 +94,71 @@ def main():
     WHERE c.Status = 'Active'
     ORDER BY c.CourseCode
     """
-    prereqs_data = execute_query(conn, prereqs_query)
-    print(json.dumps({"prerequisites_map": prereqs_data}))
+    return execute_query(conn, prereqs_query)
+
+def get_approved_waivers(conn, student_id):
+    # Approved, unexpired prerequisite waivers for a student
+    waivers_query = """
+    SELECT
+      w.WaiverID,
+      w.CourseID,
+      w.PrerequisiteID
+    FROM Waivers w
+    WHERE w.StudentID = ?
+      AND w.Status = 'Approved'
+      AND (w.ExpiryDate IS NULL OR w.ExpiryDate >= date('now'))
+    """
+    return execute_query(conn, waivers_query, (student_id,))
+
+def get_course_offerings(conn):
+    # Semesters each course has scheduled sections in, for term planning
+    offerings_query = """
+    SELECT DISTINCT
+      c.CourseCode,
+      s.Semester
+    FROM Schedules s
+    JOIN Courses c ON s.CourseID = c.CourseID
+    ORDER BY c.CourseCode, s.Semester
+    """
+    return execute_query(conn, offerings_query)
+
+def get_cohort_student_ids(conn, major=None, classification=None):
+    # Students matching a cohort query, e.g. all Juniors in Finance (major or concentration)
+    cohort_query = """
+    SELECT s.StudentID
+    FROM Students s
+    LEFT JOIN Departments d ON s.MajorID = d.DepartmentID
+    LEFT JOIN Departments cd ON s.ConcentrationID = cd.DepartmentID
+    LEFT JOIN Classification c ON s.ClassificationID = c.ClassificationID
+    WHERE (? IS NULL OR d.DepartmentName = ? OR cd.DepartmentName = ?)
+      AND (? IS NULL OR c.ClassificationName = ?)
+    ORDER BY s.StudentID
+    """
+    params = (major, major, major, classification, classification)
+    return [row['StudentID'] for row in execute_query(conn, cohort_query, params)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the data the workflow needs for a student as JSON lines")
+    parser.add_argument('student_id', type=int)
+    parser.add_argument('--db', default=DB_PATH, help="Path to sqlite_database.db")
+    parser.add_argument('--reports-dir', default='reports')
+    parser.add_argument('--snapshot', action='store_true',
+                        help="Write the catalog to the shared snapshot in reports/.catalog and print a reference to it "
+                             "instead of the full available_courses and prerequisites_map dumps")
+    args = parser.parse_args()
+    conn = get_db_connection(args.db)
+
+    print(json.dumps({"student_profile": get_student_profile(conn, args.student_id)}))
+    print(json.dumps({"academic_history": get_academic_history(conn, args.student_id)}))
+    if args.snapshot:
+        # Imported here because catalog_snapshot imports this module
+        from catalog_snapshot import ensure_catalog_snapshot, write_snapshot_reference
+        path = ensure_catalog_snapshot(conn, os.path.join(args.reports_dir, '.catalog'))
+        student_dir = os.path.join(args.reports_dir, str(args.student_id))
+        print(json.dumps({"catalog_snapshot": write_snapshot_reference(student_dir, path)}))
+    else:
+        print(json.dumps({"available_courses": get_available_courses(conn)}))
+        print(json.dumps({"prerequisites_map": get_prerequisites_map(conn)}))
 
     conn.close()
 
@@ -0,0 +1,122 @@
+"""
+Catalog-wide eligibility evaluation for a student.
+
+EligibilityEngine lays the catalog's hard prerequisites out as NumPy arrays
+over the course ID space once. For a student it then decides which courses
+they can take right now in one vectorized pass. Each requirement is met by a
+completed prerequisite whose best grade reaches its MinimumGrade, or by an
+approved waiver for that Prerequisites row.
+"""
+
+import numpy as np
+
+from prerequisite_index import PrerequisiteIndex
+
+GRADE_POINTS = {
+    'A+': 4.0, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
+    'F': 0.0,
+    'P': 2.0,  # Pass in a pass/fail course counts as a C
+}
+
+NOT_TAKEN = -1.0
+
+
+class EligibilityEngine:
+    """Hard prerequisite requirements of a catalog, as arrays over the course ID space"""
+
+    def __init__(self, courses, prerequisites_map):
+        """prerequisites_map: Prerequisites records, or a PrerequisiteIndex over them to share"""
+        self.courses = courses
+        if not isinstance(prerequisites_map, PrerequisiteIndex):
+            prerequisites_map = PrerequisiteIndex(prerequisites_map)
+        self.prerequisite_index = prerequisites_map
+
+        course_ids = [int(c['CourseID']) for c in courses]
+        course_ids += [int(p['PrerequisiteCourseID']) for p in prerequisites_map]
+        self.id_position = {course_id: i for i, course_id in enumerate(dict.fromkeys(course_ids))}
+        self.code_to_id = {c['CourseCode']: int(c['CourseID']) for c in courses}
+        for p in prerequisites_map:
+            self.code_to_id.setdefault(p['PrerequisiteCourseCode'], int(p['PrerequisiteCourseID']))
+        self.catalog_positions = np.array([self.id_position[int(c['CourseID'])] for c in courses], dtype=np.int64)
+
+        catalog_index = {int(c['CourseID']): i for i, c in enumerate(courses)}
+        hard = [p for p in prerequisites_map if p['PrerequisiteType'] == 'Hard' and int(p['CourseID']) in catalog_index]
+        self.requirement_course = np.array([catalog_index[int(p['CourseID'])] for p in hard], dtype=np.int64)
+        self.requirement_prereq = np.array([self.id_position[int(p['PrerequisiteCourseID'])] for p in hard], dtype=np.int64)
+        self.requirement_min_points = np.array([GRADE_POINTS.get(p['MinimumGrade'], 0.0) for p in hard])
+        self.requirement_ids = [p.get('PrerequisiteID') for p in hard]
+
+    def hard_requirements(self, course_code):
+        """Hard Prerequisites records of any course in the map, in the catalog or not"""
+        return [p for p in self.prerequisite_index.for_course(course_code) if p['PrerequisiteType'] == 'Hard']
+
+    def grade_points(self, academic_history):
+        """Best grade points per course ID position, NOT_TAKEN where never completed"""
+        points = np.full(len(self.id_position), NOT_TAKEN)
+        for record in academic_history:
+            course_id = record.get('CourseID', self.code_to_id.get(record['CourseCode']))
+            position = self.id_position.get(course_id)
+            if position is not None:
+                points[position] = max(points[position], GRADE_POINTS.get(record['Grade'], NOT_TAKEN))
+        return points
+
+    def completed(self, academic_history):
+        """Boolean vector over the catalog: courses the student has already taken"""
+        taken = np.zeros(len(self.id_position), dtype=bool)
+        for record in academic_history:
+            position = self.id_position.get(record.get('CourseID', self.code_to_id.get(record['CourseCode'])))
+            if position is not None:
+                taken[position] = True
+        return taken[self.catalog_positions]
+
+    def eligible(self, academic_history, waivers=()):
+        """Boolean vector over the catalog: courses whose hard prerequisites are all met or waived"""
+        points = self.grade_points(academic_history)
+        met = points[self.requirement_prereq] >= self.requirement_min_points
+
+        waived_ids = {w['PrerequisiteID'] for w in waivers}
+        if waived_ids:
+            met |= np.array([rid in waived_ids for rid in self.requirement_ids], dtype=bool)
+
+        unmet_per_course = np.bincount(self.requirement_course[~met], minlength=len(self.courses))
+        return unmet_per_course == 0
+
+    def missing_prerequisites(self, course_code, academic_history, waivers=()):
+        """Hard prerequisites, direct and indirect, the student still has to satisfy before course_code
+
+        Same rule as eligible(): a requirement is satisfied by a completed
+        prerequisite graded at or above its MinimumGrade, or by a waiver. A
+        prerequisite the student still has to take brings its own unmet
+        requirements along. Prerequisites come before the courses needing them.
+        """
+        points = self.grade_points(academic_history)
+        waived_ids = {w['PrerequisiteID'] for w in waivers}
+
+        def met(requirement):
+            position = self.id_position.get(self.code_to_id.get(requirement['PrerequisiteCourseCode']))
+            return position is not None and points[position] >= GRADE_POINTS.get(requirement['MinimumGrade'], 0.0)
+
+        missing = []
+        visited = {course_code}
+
+        def visit(code):
+            for requirement in self.hard_requirements(code):
+                prereq_code = requirement['PrerequisiteCourseCode']
+                if prereq_code in visited or requirement.get('PrerequisiteID') in waived_ids or met(requirement):
+                    continue
+                visited.add(prereq_code)
+                visit(prereq_code)
+                missing.append(prereq_code)
+
+        visit(course_code)
+        return missing
+
+    def available_now(self, academic_history, waivers=()):
+        """Courses the student is eligible for and has not already taken"""
+        return self.eligible(academic_history, waivers) & ~self.completed(academic_history)
+
+    def eligible_course_codes(self, academic_history, waivers=()):
+        return [self.courses[i]['CourseCode'] for i in np.flatnonzero(self.eligible(academic_history, waivers))]
@@ -0,0 +1,55 @@
+"""
+Cache of built Plotly figures for the dashboard charts.
+
+Figures are keyed by chart name and a hash of the DataFrame they are built
+from, so a rerun with unchanged data reuses the figure built earlier instead
+of running plotly express (grouping, trace generation and validation) again.
+Only building is skipped: st.plotly_chart accepts a figure or dict, not a
+serialized spec, and still converts the cached figure to JSON on every
+render. Cached figures are shared across sessions and must not be modified.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+DEFAULT_MAX_FIGURES = 64
+
+
+def data_fingerprint(data):
+    """Stable hash of a chart's input DataFrame: column names, dtypes, index and values"""
+    digest = hashlib.sha1()
+    digest.update(repr((list(data.columns), [str(dtype) for dtype in data.dtypes])).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """Built figures keyed by (chart name, data fingerprint), least recently used evicted first"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_FIGURES):
+        self.max_entries = max_entries
+        self._figures = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chart_name, data, build_figure):
+        """build_figure(data), reusing the figure from an earlier call with the same data"""
+        key = (chart_name, data_fingerprint(data))
+        with self._lock:
+            figure = self._figures.get(key)
+            if figure is not None:
+                self._figures.move_to_end(key)
+                self.hits += 1
+                return figure
+            self.misses += 1
+
+        figure = build_figure(data)
+        with self._lock:
+            self._figures[key] = figure
+            while len(self._figures) > self.max_entries:
+                self._figures.popitem(last=False)
+        return figure
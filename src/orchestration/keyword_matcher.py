@@ -0,0 +1,43 @@
+"""
+Multi-pattern keyword matching for the Course Matcher.
+
+KeywordMatcher compiles a whole keyword set into one regular expression and
+finds every keyword contained in a text in a single pass, with the same
+substring semantics as `keyword in text`, including overlapping keywords such
+as "investment" and "investments".
+"""
+
+import re
+from functools import lru_cache
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of (lowercase) keywords occur in a text"""
+
+    def __init__(self, keywords):
+        self.keywords = tuple(dict.fromkeys(keywords))
+
+        # Longest-first alternation inside a lookahead tries every start position and
+        # reports the longest keyword there; shorter keywords matching at the same
+        # position are exactly its prefixes, so they are added back via prefix_hits.
+        by_length = sorted(self.keywords, key=len, reverse=True)
+        self.pattern = re.compile('(?=(' + '|'.join(re.escape(k) for k in by_length) + '))') if by_length else None
+        self.prefix_hits = {
+            keyword: frozenset(k for k in self.keywords if keyword.startswith(k))
+            for keyword in self.keywords
+        }
+
+    def find(self, text):
+        """Set of keywords contained in text"""
+        if self.pattern is None:
+            return set()
+        hits = set()
+        for match in self.pattern.finditer(text):
+            hits.update(self.prefix_hits[match.group(1)])
+        return hits
+
+
+@lru_cache(maxsize=1024)
+def get_keyword_matcher(keywords):
+    """Compiled matcher for a keyword tuple, built once and reused across courses and students"""
+    return KeywordMatcher(keywords)
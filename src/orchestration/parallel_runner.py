@@ -0,0 +1,120 @@
+"""
+Process-pool runner for the deterministic pipeline stages.
+
+Spreads students across a concurrent.futures process pool. Each worker builds
+one StudentPipeline, so the scoring engine is built once per worker rather
+than once per student. The parent writes the shared catalog snapshot before
+the pool starts and every worker memory-maps it read-only, so the catalog
+text and the matcher's term index are held once in the page cache instead
+of being built once per worker. A failure
+for one student is recorded in the summary and does not stop the run.
+"""
+
+import argparse
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from catalog_snapshot import ensure_catalog_snapshot
+from database_queries import DB_PATH, get_db_connection, get_cohort_student_ids
+from pipeline import StudentPipeline
+from report_generator import update_manifest
+
+_worker_pipeline = None
+
+
+def _init_worker(db_path, reports_dir, write_artifacts, snapshot_path):
+    global _worker_pipeline
+    _worker_pipeline = StudentPipeline(db_path, reports_dir, write_artifacts=write_artifacts,
+                                       catalog_snapshot=snapshot_path)
+    _worker_pipeline.get_scoring_engine()
+
+
+def _run_student(student_id):
+    try:
+        result = _worker_pipeline.run(student_id)
+    except Exception as e:
+        return {
+            "student_id": student_id,
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+    return {
+        "student_id": student_id,
+        "status": "success",
+        "total_recommendations": result['recommendations']['total_recommendations'],
+        "report_path": result['report_path'],
+        "digest": result['report_digest'],
+    }
+
+
+def run_parallel(student_ids, db_path=DB_PATH, reports_dir='reports', workers=None, write_artifacts=False):
+    """Run the pipeline for every student on a process pool and return an aggregated summary"""
+    started = time.perf_counter()
+    conn = get_db_connection(db_path)
+    try:
+        snapshot_path = ensure_catalog_snapshot(conn, os.path.join(reports_dir, '.catalog'))
+    finally:
+        conn.close()
+
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(db_path, reports_dir, write_artifacts, snapshot_path)) as executor:
+        futures = {executor.submit(_run_student, student_id): student_id for student_id in student_ids}
+        for future in as_completed(futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker itself died (e.g. BrokenProcessPool), not just the student's run
+                results.append({"student_id": futures[future], "status": "error", "error": f"{type(e).__name__}: {e}"})
+
+    # Only the parent writes the manifest, so workers never race on it
+    update_manifest(reports_dir, results)
+
+    order = {student_id: i for i, student_id in enumerate(student_ids)}
+    results.sort(key=lambda r: order[r['student_id']])
+    failures = [r for r in results if r['status'] == 'error']
+    return {
+        "total_students": len(student_ids),
+        "succeeded": len(results) - len(failures),
+        "failed": len(failures),
+        "failures": failures,
+        "results": results,
+        "elapsed_seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the deterministic recommendation stages on a process pool")
+    parser.add_argument('student_ids', nargs='*', type=int, help="Student IDs (omit to use --major/--classification)")
+    parser.add_argument('--major', help="Cohort query: major or concentration name, e.g. Finance")
+    parser.add_argument('--classification', help="Cohort query: classification name, e.g. Junior")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument('--db', default=DB_PATH, help="Path to sqlite_database.db")
+    parser.add_argument('--reports-dir', default='reports')
+    parser.add_argument('--write-artifacts', action='store_true',
+                        help="Also write the intermediate JSON files for auditing")
+    args = parser.parse_args()
+
+    if not args.student_ids and not (args.major or args.classification):
+        parser.error("give student IDs or a cohort query (--major and/or --classification)")
+
+    student_ids = args.student_ids
+    if not student_ids:
+        conn = get_db_connection(args.db)
+        try:
+            student_ids = get_cohort_student_ids(conn, args.major, args.classification)
+        finally:
+            conn.close()
+
+    summary = run_parallel(student_ids, args.db, args.reports_dir, args.workers, args.write_artifacts)
+
+    print(f"Processed {summary['total_students']} students with {args.workers} workers "
+          f"in {summary['elapsed_seconds']}s: {summary['succeeded']} succeeded, {summary['failed']} failed")
+    for failure in summary['failures']:
+        print(f"  Student {failure['student_id']}: {failure['error']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,184 @@
+"""
+In-process runner for the deterministic stages of the recommendation workflow.
+
+Runs course matching, recommendation building and report generation for one or
+more students in a single interpreter, passing Python objects between stages
+instead of round-tripping through the JSON files in reports/{student_id}/.
+The intermediate JSON artifacts are only written when write_artifacts is set.
+"""
+
+import argparse
+import json
+import os
+
+from database_queries import DB_PATH, get_db_connection, get_academic_history, get_approved_waivers, get_course_offerings
+from catalog_snapshot import load_snapshot_features, write_catalog_snapshot, write_snapshot_reference
+from course_features import load_course_features
+from course_matcher import match_courses
+from course_planner import MAX_TERM_CREDITS, CoursePlanner
+from eligibility import EligibilityEngine
+from scoring_engine import TOP_K, CourseScoringEngine
+from recommendation_builder import build_recommendations
+from report_generator import generate_report as generate_report_file, update_manifest
+
+
+class StudentPipeline:
+    """Runs course matching -> recommendations -> report for a student in memory"""
+
+    def __init__(self, db_path=DB_PATH, reports_dir='reports', write_artifacts=False, top_k=TOP_K, eligible_only=False,
+                 max_credits=MAX_TERM_CREDITS, catalog_snapshot=None):
+        self.db_path = db_path
+        self.reports_dir = reports_dir
+        self.write_artifacts = write_artifacts
+        self.top_k = top_k
+        self.eligible_only = eligible_only
+        self.max_credits = max_credits
+        self._conn = None
+        self._features = None
+        self._engine = None
+        self._eligibility = None
+        self._planner = None
+        # Shared snapshot directory to memory-map the catalog from (see parallel_runner)
+        self._snapshot_path = catalog_snapshot
+
+    def get_connection(self):
+        if self._conn is None:
+            self._conn = get_db_connection(self.db_path)
+        return self._conn
+
+    def get_course_features(self):
+        """Course feature store for the current catalog version, from the on-disk cache when possible"""
+        if self._features is None:
+            if self._snapshot_path is not None:
+                self._features = load_snapshot_features(self._snapshot_path)
+            else:
+                self._features = load_course_features(self.get_connection(), os.path.join(self.reports_dir, '.cache'))
+        return self._features
+
+    def load_catalog(self):
+        """Active course catalog and prerequisite map, loaded once per pipeline"""
+        features = self.get_course_features()
+        return features.courses, features.prerequisites_map
+
+    def get_scoring_engine(self):
+        """Scoring engine over the loaded catalog, shared by every student in the run"""
+        if self._engine is None:
+            self._engine = CourseScoringEngine.from_feature_store(self.get_course_features())
+        return self._engine
+
+    def get_catalog_snapshot(self):
+        """Shared catalog snapshot directory for the loaded catalog version, written on first use"""
+        if self._snapshot_path is None:
+            features = self.get_course_features()
+            self._snapshot_path = write_catalog_snapshot(features.version, features.courses,
+                                                         features.prerequisites_map,
+                                                         os.path.join(self.reports_dir, '.catalog'))
+        return self._snapshot_path
+
+    def get_eligibility_engine(self):
+        if self._eligibility is None:
+            available_courses, _ = self.load_catalog()
+            self._eligibility = EligibilityEngine(available_courses, self.get_course_features().prerequisite_index)
+        return self._eligibility
+
+    def get_course_planner(self):
+        """Term planner over the prerequisite graph and Schedules offerings; its plan memo is shared by every student"""
+        if self._planner is None:
+            available_courses, _ = self.load_catalog()
+            offerings = get_course_offerings(self.get_connection())
+            self._planner = CoursePlanner.from_catalog(self.get_course_features().prerequisite_graph,
+                                                       self.get_eligibility_engine(), available_courses, offerings,
+                                                       self.max_credits)
+        return self._planner
+
+    def student_dir(self, student_id):
+        return os.path.join(self.reports_dir, str(student_id))
+
+    def load_profile(self, student_id):
+        """Read the Profile Analyzer Agent output for a student"""
+        with open(os.path.join(self.student_dir(student_id), 'profile_output.json'), 'r') as f:
+            return json.load(f)
+
+    def run(self, student_id, student_profile=None, academic_history=None, generate_report=True):
+        if student_profile is None:
+            student_profile = self.load_profile(student_id)
+        if academic_history is None:
+            academic_history = get_academic_history(self.get_connection(), student_id)
+        available_courses, _ = self.load_catalog()
+
+        waivers = get_approved_waivers(self.get_connection(), student_id)
+        course_mask = None
+        if self.eligible_only:
+            # Only match courses the student can register for now
+            course_mask = self.get_eligibility_engine().available_now(academic_history, waivers)
+
+        matched_courses = match_courses(student_profile, available_courses, self.get_scoring_engine(), self.top_k, course_mask)
+        recommendations = build_recommendations(student_profile, matched_courses, academic_history,
+                                                self.get_course_planner(), self.get_eligibility_engine(), waivers)
+
+        output_dir = self.student_dir(student_id)
+        if self.write_artifacts or generate_report:
+            os.makedirs(output_dir, exist_ok=True)
+        if self.write_artifacts:
+            # The catalog goes to the shared snapshot once per version, not into every student directory
+            write_snapshot_reference(output_dir, self.get_catalog_snapshot())
+            self._write_artifacts(output_dir, {
+                'academic_history.json': {"academic_history": academic_history},
+                'matched_courses.json': matched_courses,
+                'recommendations.json': recommendations,
+            })
+
+        # Reuses the existing report when the inputs are unchanged
+        report = generate_report_file(student_profile, recommendations, output_dir) if generate_report else None
+
+        return {
+            "student_id": student_id,
+            "matched_courses": matched_courses,
+            "recommendations": recommendations,
+            "report_path": report['report_path'] if report else None,
+            "report_digest": report['digest'] if report else None,
+        }
+
+    def _write_artifacts(self, output_dir, artifacts):
+        for filename, data in artifacts.items():
+            with open(os.path.join(output_dir, filename), 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the deterministic recommendation stages in one process")
+    parser.add_argument('student_ids', nargs='+', type=int)
+    parser.add_argument('--db', default=DB_PATH, help="Path to sqlite_database.db")
+    parser.add_argument('--reports-dir', default='reports')
+    parser.add_argument('--write-artifacts', action='store_true',
+                        help="Also write the intermediate JSON files for auditing")
+    parser.add_argument('--no-report', action='store_true', help="Skip HTML report generation")
+    parser.add_argument('--eligible-only', action='store_true',
+                        help="Only match courses the student is eligible for and has not taken")
+    parser.add_argument('--max-credits', type=int, default=MAX_TERM_CREDITS,
+                        help="Credit limit per term for the course plan")
+    args = parser.parse_args()
+
+    pipeline = StudentPipeline(args.db, args.reports_dir, write_artifacts=args.write_artifacts,
+                               eligible_only=args.eligible_only, max_credits=args.max_credits)
+    reports = []
+    try:
+        for student_id in args.student_ids:
+            result = pipeline.run(student_id, generate_report=not args.no_report)
+            print(f"Student {student_id}: {result['recommendations']['total_recommendations']} recommendations"
+                  + (f", report: {result['report_path']}" if result['report_path'] else ""))
+            if result['report_path']:
+                reports.append({"student_id": student_id, "report_path": result['report_path'],
+                                "digest": result['report_digest']})
+    finally:
+        pipeline.close()
+        if reports:
+            update_manifest(args.reports_dir, reports)
+
+if __name__ == '__main__':
+    main()
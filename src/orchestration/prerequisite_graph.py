@@ -0,0 +1,149 @@
+"""
+Prerequisite graph engine over the Prerequisites table.
+
+Topologically sorts the course -> prerequisite graph and precomputes each
+course's transitive prerequisite closure as an integer bitset over the
+topological order. Only Hard and Recommended rows order courses;
+co-requisites (which may name each other) are kept separately. A cycle
+left in the ordering graph is logged and broken by dropping its back edge
+rather than failing the catalog load. Finding the full set of courses a student
+still needs to reach a course is then a couple of bit operations in the
+common cases, plus a walk restricted to unfinished courses when the student
+has completed part of the chain.
+"""
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prerequisite types that must be completed before the course, and so order the graph
+ORDERING_TYPES = ('Hard', 'Recommended')
+
+
+class PrerequisiteGraph:
+    """Direct and transitive prerequisites for every course, keyed by course code"""
+
+    # Bound on memoized (course, completed set) answers kept across students
+    MAX_CACHED_ANSWERS = 100000
+
+    def __init__(self, prerequisites_map, prerequisite_types=ORDERING_TYPES):
+        self.direct = {}
+        # Co-requisites (taken before or alongside the course), by course code
+        self.corequisites = {}
+        for record in prerequisites_map:
+            if record['PrerequisiteType'] == 'Co-requisite':
+                corequisites = self.corequisites.setdefault(record['CourseCode'], [])
+                if record['PrerequisiteCourseCode'] not in corequisites:
+                    corequisites.append(record['PrerequisiteCourseCode'])
+            if prerequisite_types is not None and record['PrerequisiteType'] not in prerequisite_types:
+                continue
+            prereqs = self.direct.setdefault(record['CourseCode'], [])
+            self.direct.setdefault(record['PrerequisiteCourseCode'], [])
+            if record['PrerequisiteCourseCode'] not in prereqs:
+                prereqs.append(record['PrerequisiteCourseCode'])
+
+        # (course, prerequisite) edges removed to break cycles
+        self.dropped_edges = []
+        self.order = self._topological_order()
+        while len(self.order) != len(self.direct):
+            cycle = self._find_cycle(set(self.direct) - set(self.order))
+            course, prereq = cycle[-2], cycle[-1]
+            logger.warning("Prerequisite cycle detected: %s; ignoring %s -> %s",
+                           ' -> '.join(cycle), course, prereq)
+            self.direct[course].remove(prereq)
+            self.dropped_edges.append((course, prereq))
+            self.order = self._topological_order()
+        self.position = {code: i for i, code in enumerate(self.order)}
+
+        # closure[i]: bitset of every course that must come before order[i]
+        self.closure = [0] * len(self.order)
+        for i, code in enumerate(self.order):
+            bits = 0
+            for prereq in self.direct[code]:
+                j = self.position[prereq]
+                bits |= (1 << j) | self.closure[j]
+            self.closure[i] = bits
+
+        self._missing_cache = {}
+
+    def _topological_order(self):
+        # Kahn's algorithm; prerequisites come before the courses that need them
+        dependents = {code: [] for code in self.direct}
+        remaining = {code: len(prereqs) for code, prereqs in self.direct.items()}
+        for code, prereqs in self.direct.items():
+            for prereq in prereqs:
+                dependents[prereq].append(code)
+
+        ready = sorted(code for code, count in remaining.items() if count == 0)
+        order = []
+        while ready:
+            code = ready.pop()
+            order.append(code)
+            for dependent in dependents[code]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+        # Shorter than self.direct when the graph has a cycle
+        return order
+
+    def _find_cycle(self, unresolved):
+        # Every unresolved course has an unresolved prerequisite, so following them must revisit a course
+        path = [min(unresolved)]
+        seen = {path[0]: 0}
+        while True:
+            code = next(p for p in self.direct[path[-1]] if p in unresolved)
+            if code in seen:
+                return path[seen[code]:] + [code]
+            seen[code] = len(path)
+            path.append(code)
+
+    def bitset(self, course_codes):
+        bits = 0
+        for code in course_codes:
+            if code in self.position:
+                bits |= 1 << self.position[code]
+        return bits
+
+    def codes(self, bits):
+        """Course codes in a bitset, prerequisites first"""
+        codes = []
+        while bits:
+            low = bits & -bits
+            codes.append(self.order[low.bit_length() - 1])
+            bits ^= low
+        return codes
+
+    def all_prerequisites(self, course_code):
+        """Every direct and indirect prerequisite of a course, prerequisites first"""
+        if course_code not in self.position:
+            return []
+        return self.codes(self.closure[self.position[course_code]])
+
+    def missing_prerequisites(self, course_code, completed_course_codes):
+        """Full set of courses a student still has to take before course_code, prerequisites first
+
+        A completed course satisfies its own prerequisites, so they are not reported.
+        """
+        if course_code not in self.position:
+            return []
+        return self.codes(self.missing_bits(self.position[course_code], self.bitset(completed_course_codes)))
+
+    def missing_bits(self, i, completed_bits):
+        closure = self.closure[i]
+        if not closure & ~completed_bits:
+            return 0
+        if not closure & completed_bits:
+            return closure
+
+        key = (i, completed_bits)
+        bits = self._missing_cache.get(key)
+        if bits is None:
+            bits = 0
+            for prereq in self.direct[self.order[i]]:
+                j = self.position[prereq]
+                if not completed_bits >> j & 1:
+                    bits |= (1 << j) | self.missing_bits(j, completed_bits)
+            if len(self._missing_cache) >= self.MAX_CACHED_ANSWERS:
+                self._missing_cache.clear()
+            self._missing_cache[key] = bits
+        return bits
@@ -0,0 +1,57 @@
+"""
+Prerequisite lookup index shared by the recommendation builder, batch runs
+and the Streamlit course details page.
+
+Groups prerequisite records by course code and course ID once, so looking up
+a course's prerequisites is a dict access instead of a scan of the whole
+prerequisites map. Iterating the index yields the records in their original
+order, so it can stand in for the prerequisites map when building the
+eligibility engine and the prerequisite graph.
+"""
+
+PREREQUISITE_DETAILS_QUERY = """
+SELECT
+  c.CourseID,
+  c.CourseCode,
+  p.PrerequisiteCourseID,
+  pc.CourseCode as PrerequisiteCourseCode,
+  pc.CourseName as PrerequisiteCourseName,
+  p.MinimumGrade,
+  p.PrerequisiteType,
+  p.Notes
+FROM Prerequisites p
+JOIN Courses c ON p.CourseID = c.CourseID
+JOIN Courses pc ON p.PrerequisiteCourseID = pc.CourseID
+ORDER BY c.CourseID, p.PrerequisiteType DESC
+"""
+
+
+class PrerequisiteIndex:
+    """Prerequisite records (MinimumGrade, PrerequisiteType, ...) keyed by course code and course ID"""
+
+    def __init__(self, prerequisites_map):
+        self.records = list(prerequisites_map)
+        self.by_code = {}
+        self.by_id = {}
+        for record in self.records:
+            self.by_code.setdefault(record['CourseCode'], []).append(record)
+            self.by_id.setdefault(int(record['CourseID']), []).append(record)
+
+    def for_course(self, course_code):
+        return self.by_code.get(course_code, [])
+
+    def for_course_id(self, course_id):
+        return self.by_id.get(int(course_id), [])
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+
+def load_prerequisite_index(conn):
+    """Index over every Prerequisites row, including course names and notes for display"""
+    cursor = conn.execute(PREREQUISITE_DETAILS_QUERY)
+    columns = [column[0] for column in cursor.description]
+    return PrerequisiteIndex([dict(zip(columns, row)) for row in cursor.fetchall()])
@@ -0,0 +1,118 @@
+"""
+Result cache for the dashboard's lookup queries.
+
+Entries expire after a TTL and are dropped as soon as the database changes.
+Changes are detected with SQLite's PRAGMA data_version, which is a cheap
+per-connection counter that moves whenever another connection commits. Each
+pooled connection's last seen value is tracked, so a commit invalidates the
+cache on the next query from any connection. Cached results are shared across
+sessions and must be treated as read-only.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 600
+DEFAULT_MAX_ENTRIES = 256
+
+
+class QueryCache:
+    """TTL + data_version invalidated cache of query function results, with hit/miss counters"""
+
+    def __init__(self, ttl=DEFAULT_TTL, max_entries=DEFAULT_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._data_versions = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def check_data_version(self, conn):
+        """Drop every entry if the database changed since this connection last looked"""
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._lock:
+            # A connection seen for the first time has no baseline, so it cannot vouch for the entries
+            if self._data_versions.get(id(conn)) != version:
+                self._data_versions[id(conn)] = version
+                self._clear()
+
+    def fetch(self, conn, query_function, *args):
+        """query_function(conn, *args), from the cache when still valid"""
+        self.check_data_version(conn)
+        key = (query_function.__name__,) + args
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        result = query_function(conn, *args)
+        with self._lock:
+            self._store(key, now + self.ttl, result)
+        return result
+
+    def fetch_many(self, conn, query_function, keys):
+        """{key: result} for every key, cached per key
+
+        query_function(conn, missing_keys) loads the keys that are not cached
+        in one batch and returns {key: result}; keys it omits cache as None.
+        """
+        self.check_data_version(conn)
+        name = query_function.__name__
+        now = time.monotonic()
+        results, missing = {}, []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                entry = self._entries.get((name, key))
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end((name, key))
+                    self.hits += 1
+                    results[key] = entry[1]
+                else:
+                    self.misses += 1
+                    missing.append(key)
+
+        if missing:
+            loaded = query_function(conn, missing)
+            with self._lock:
+                for key in missing:
+                    results[key] = loaded.get(key)
+                    self._store((name, key), now + self.ttl, results[key])
+        return results
+
+    def _store(self, key, expires_at, result):
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _clear(self):
+        if self._entries:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def invalidate(self, query_name=None):
+        """Drop every entry, or only those of one query function"""
+        with self._lock:
+            if query_name is None:
+                self._clear()
+            else:
+                for key in [k for k in self._entries if k[0] == query_name]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,67 +1,105 @@
 import json
 import sys
 
-student_id = sys.argv[1]
+from catalog_snapshot import load_student_catalog
+from database_queries import DB_PATH, get_db_connection, get_approved_waivers, get_course_offerings
+from eligibility import EligibilityEngine
+from prerequisite_graph import PrerequisiteGraph
+from prerequisite_index import PrerequisiteIndex
+from course_planner import CoursePlanner, course_terms
 
-with open(f'reports/{student_id}/profile_output.json', 'r') as f:
-    student_profile = json.load(f)
+def build_recommendations(student_profile, matched_courses, student_completed_courses, course_planner,
+                          eligibility_engine, waivers=()):
+    # course_planner: CoursePlanner.from_catalog (Schedules offerings); eligibility_engine: EligibilityEngine
+    completed_course_codes = {c['CourseCode'] for c in student_completed_courses}
 
-with open(f'reports/{student_id}/matched_courses.json', 'r') as f:
-    matched_courses = json.load(f)
+    recommendations = []
+    prerequisites_to_prioritize = {}
 
-with open(f'reports/{student_id}/academic_history.json', 'r') as f:
-    academic_history_data = json.load(f)
-    student_completed_courses = academic_history_data.get('academic_history', [])
+    for rank, course in enumerate(matched_courses[:5], 1):
+        eligibility_status = "eligible"
+        missing_prerequisites = []
 
-with open(f'reports/{student_id}/prerequisites_map.json', 'r') as f:
-    prerequisites_map_data = json.load(f)
-    prerequisites_map = prerequisites_map_data.get('prerequisites_map', [])
+        if course['course_code'] in completed_course_codes:
+            continue
 
-completed_course_codes = {c['CourseCode'] for c in student_completed_courses}
-
-recommendations = []
-prerequisites_to_prioritize = {}
-
-for rank, course in enumerate(matched_courses[:5], 1):
-    eligibility_status = "eligible"
-    missing_prerequisites = []
-
-    if course['course_code'] in completed_course_codes:
-        continue
-
-    required_prereqs = [p['PrerequisiteCourseCode'] for p in prerequisites_map if p['CourseCode'] == course['course_code']]
-    for prereq_code in required_prereqs:
-        if prereq_code not in completed_course_codes:
+        # Full chain of unmet hard prerequisites (minimum grades and waivers applied, as in
+        # EligibilityEngine.eligible), not just the direct ones, earliest first
+        for prereq_code in eligibility_engine.missing_prerequisites(course['course_code'], student_completed_courses,
+                                                                     waivers):
             eligibility_status = "prerequisites_needed"
             missing_prerequisites.append(prereq_code)
             if prereq_code not in prerequisites_to_prioritize:
                 prerequisites_to_prioritize[prereq_code] = f"Required for {course['course_code']}"
 
-    recommendation_text = f"This course, {course['course_name']}, directly aligns with your interest in {student_profile['interests'][0]} and your career goal of {student_profile['career_goals']}. "
-    if eligibility_status == "eligible":
-        recommendation_text += "You have met all prerequisites, so you can take this course in the next semester. This will build on your strong subjects and prepare you for advanced topics in your field."
-    else:
-        recommendation_text += f"However, you are missing the following prerequisites: {', '.join(missing_prerequisites)}. I recommend you take these courses first, and then you will be ready to take {course['course_name']}."
-
-    recommendations.append({
-        "rank": rank,
-        "course_id": course['course_id'],
-        "course_code": course['course_code'],
-        "course_name": course['course_name'],
-        "credits": course['credits'],
-        "difficulty_level": course['difficulty_level'],
-        "relevance_score": course['relevance_score'],
-        "eligibility_status": eligibility_status,
-        "missing_prerequisites": missing_prerequisites,
-        "recommendation_text": recommendation_text,
-        "suggested_semester": "Spring 2026" if eligibility_status == "prerequisites_needed" else "Fall 2025"
-    })
-
-output = {
-    "recommendations": recommendations,
-    "total_recommendations": len(recommendations),
-    "prerequisites_to_prioritize": [{"course_code": k, "reason": v} for k, v in prerequisites_to_prioritize.items()]
-}
-
-with open(f'reports/{student_id}/recommendations.json', 'w') as f:
-    json.dump(output, f, indent=2)
\ No newline at end of file
+        recommendation_text = f"This course, {course['course_name']}, directly aligns with your interest in {student_profile['interests'][0]} and your career goal of {student_profile['career_goals']}. "
+        if eligibility_status == "eligible":
+            recommendation_text += "You have met all prerequisites, so you can take this course in the next semester. This will build on your strong subjects and prepare you for advanced topics in your field."
+        else:
+            recommendation_text += f"However, you are missing the following prerequisites: {', '.join(missing_prerequisites)}. I recommend you take these courses first, and then you will be ready to take {course['course_name']}."
+
+        recommendations.append({
+            "rank": rank,
+            "course_id": course['course_id'],
+            "course_code": course['course_code'],
+            "course_name": course['course_name'],
+            "credits": course['credits'],
+            "difficulty_level": course['difficulty_level'],
+            "relevance_score": course['relevance_score'],
+            "eligibility_status": eligibility_status,
+            "missing_prerequisites": missing_prerequisites,
+            "recommendation_text": recommendation_text,
+            "suggested_semester": None
+        })
+
+    # Term-by-term plan that gets the student into every recommended course
+    course_plan = course_planner.plan(student_completed_courses, [r['course_code'] for r in recommendations],
+                                      course_planner.start_term(student_completed_courses), waivers)
+    planned_terms = course_terms(course_plan)
+    for recommendation in recommendations:
+        recommendation['suggested_semester'] = planned_terms.get(recommendation['course_code'])
+
+    return {
+        "recommendations": recommendations,
+        "total_recommendations": len(recommendations),
+        "prerequisites_to_prioritize": [{"course_code": k, "reason": v} for k, v in prerequisites_to_prioritize.items()],
+        "course_plan": course_plan
+    }
+
+def main():
+    student_id = sys.argv[1]
+    db_path = sys.argv[2] if len(sys.argv) > 2 else DB_PATH
+
+    with open(f'reports/{student_id}/profile_output.json', 'r') as f:
+        student_profile = json.load(f)
+
+    with open(f'reports/{student_id}/matched_courses.json', 'r') as f:
+        matched_courses = json.load(f)
+
+    with open(f'reports/{student_id}/academic_history.json', 'r') as f:
+        academic_history_data = json.load(f)
+        student_completed_courses = academic_history_data.get('academic_history', [])
+
+    prerequisites_map = load_student_catalog(f'reports/{student_id}', 'prerequisites_map')
+    available_courses = load_student_catalog(f'reports/{student_id}', 'available_courses')
+
+    # Same planner and eligibility rule as pipeline.py: Schedules offerings and approved waivers
+    conn = get_db_connection(db_path)
+    try:
+        offerings = get_course_offerings(conn)
+        waivers = get_approved_waivers(conn, int(student_id))
+    finally:
+        conn.close()
+    prerequisite_index = PrerequisiteIndex(prerequisites_map)
+    eligibility_engine = EligibilityEngine(available_courses, prerequisite_index)
+    course_planner = CoursePlanner.from_catalog(PrerequisiteGraph(prerequisite_index), eligibility_engine,
+                                                available_courses, offerings)
+
+    output = build_recommendations(student_profile, matched_courses, student_completed_courses, course_planner,
+                                   eligibility_engine, waivers)
+
+    with open(f'reports/{student_id}/recommendations.json', 'w') as f:
+        json.dump(output, f, indent=2)
+
+if __name__ == '__main__':
+    main()
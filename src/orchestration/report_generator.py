@@ -1,17 +1,56 @@
+import argparse
+import glob
+import hashlib
+import html
+import io
 import json
-import sys
+import os
+import string
+import time
+import traceback
+import types
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 
-student_id = sys.argv[1]
 
-# --- 1. Load Data ---
-with open(f'reports/{student_id}/profile_output.json', 'r') as f:
-    profile_data = json.load(f)
+class CompiledTemplate:
+    """A str.format template parsed once into literal text and field names
+
+    write() streams the literal text and field values to a file-like object.
+    A field value may be a string, any other value (formatted like
+    str.format would), or a list/generator of strings written piece by piece.
+    """
+
+    def __init__(self, template):
+        self.parts = []
+        for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+            if format_spec or conversion:
+                raise ValueError(f"Unsupported format spec or conversion on field {field_name!r}")
+            self.parts.append((literal, field_name))
+        self.field_names = {field_name for _, field_name in self.parts if field_name is not None}
+
+    def write(self, out, fields):
+        for literal, field_name in self.parts:
+            if literal:
+                out.write(literal)
+            if field_name is None:
+                continue
+            value = fields[field_name]
+            if isinstance(value, str):
+                out.write(value)
+            elif isinstance(value, (list, tuple, types.GeneratorType)):
+                for chunk in value:
+                    out.write(chunk)
+            else:
+                out.write(format(value, ''))
+
+    def render(self, fields):
+        buffer = io.StringIO()
+        self.write(buffer, fields)
+        return buffer.getvalue()
 
-with open(f'reports/{student_id}/recommendations.json', 'r', encoding='utf-8') as f:
-    recommendations_data = json.load(f)
 
-# --- 2. Define HTML Structure and CSS ---
+# --- 1. Define HTML Structure and CSS ---
 html_template = """
 <!DOCTYPE html>
 <html lang="en">
@@ -191,67 +230,354 @@ html_template = """
 </html>
 """
 
-# --- 3. Generate HTML Content from Data ---
-
-# Course Recommendations
-course_recs_html = ""
-for rec in recommendations_data['recommendations']:
-    status_class = f"status-{rec['eligibility_status']}"
-    status_text = rec['eligibility_status'].replace('_', ' ').title()
-    missing_prereqs_html = ""
-    if rec['missing_prerequisites']:
-        missing_prereqs_html = f"<p><strong>Missing Prerequisites:</strong> {', '.join(rec['missing_prerequisites'])}</p>"
-
-    course_recs_html += f"""
-    <div class="recommendation">
-        <div class="rec-header">
-            <h3>{rec['rank']}. {rec['course_code']} - {rec['course_name']}</h3>
-            <span class="status {status_class}">{status_text}</span>
-        </div>
-        <div class="rec-body">
-            <div class="rec-details">
-                <div><span>Department:</span> {rec.get('department', 'N/A')}</div>
-                <div><span>Credits:</span> {rec['credits']}</div>
-                <div><span>Difficulty:</span> {rec['difficulty_level']}</div>
-                <div><span>Relevance:</span> {rec['relevance_score']}/100</div>
+# Compiled once per process and reused for every student
+REPORT_TEMPLATE = CompiledTemplate(html_template)
+
+RECOMMENDATION_CARD_TEMPLATE = CompiledTemplate("""
+        <div class="recommendation">
+            <div class="rec-header">
+                <h3>{rank}. {course_code} - {course_name}</h3>
+                <span class="status {status_class}">{status_text}</span>
+            </div>
+            <div class="rec-body">
+                <div class="rec-details">
+                    <div><span>Department:</span> {department}</div>
+                    <div><span>Credits:</span> {credits}</div>
+                    <div><span>Difficulty:</span> {difficulty_level}</div>
+                    <div><span>Relevance:</span> {relevance_score}/100</div>
+                </div>
+                <p>{recommendation_text}</p>
+                {missing_prereqs_html}
+                <p><strong>Suggested Semester:</strong> {suggested_semester}</p>
             </div>
-            <p>{rec['recommendation_text']}</p>
-            {missing_prereqs_html}
-            <p><strong>Suggested Semester:</strong> {rec['suggested_semester']}</p>
         </div>
+        """)
+
+# --- 2. Generate HTML Content from Data ---
+def recommendation_cards(recommendations_data):
+    """Course recommendation cards, one HTML string per recommendation"""
+    for rec in recommendations_data['recommendations']:
+        missing_prereqs_html = ""
+        if rec['missing_prerequisites']:
+            missing_prereqs_html = f"<p><strong>Missing Prerequisites:</strong> {', '.join(rec['missing_prerequisites'])}</p>"
+
+        yield RECOMMENDATION_CARD_TEMPLATE.render({
+            'rank': rec['rank'],
+            'course_code': rec['course_code'],
+            'course_name': rec['course_name'],
+            'status_class': f"status-{rec['eligibility_status']}",
+            'status_text': rec['eligibility_status'].replace('_', ' ').title(),
+            'department': rec.get('department', 'N/A'),
+            'credits': rec['credits'],
+            'difficulty_level': rec['difficulty_level'],
+            'relevance_score': rec['relevance_score'],
+            'recommendation_text': rec['recommendation_text'],
+            'missing_prereqs_html': missing_prereqs_html,
+            'suggested_semester': rec['suggested_semester'],
+        })
+
+def prerequisite_items(recommendations_data):
+    """Prerequisite Roadmap list, in pieces"""
+    yield "<ul class='prereq-list'>"
+    if recommendations_data['prerequisites_to_prioritize']:
+        for prereq in recommendations_data['prerequisites_to_prioritize']:
+            yield f"<li><code>{prereq['course_code']}</code> - {prereq['reason']}</li>"
+    else:
+        yield "<li>No prerequisites need to be prioritized at this time. You are eligible for your top recommendations!</li>"
+    yield "</ul>"
+
+def report_fields(profile_data, recommendations_data):
+    return {
+        'student_id': profile_data['student_id'],
+        'student_name': f"{profile_data.get('FirstName', '')} {profile_data.get('LastName', '')}".strip(),
+        'gpa': profile_data['gpa'],
+        'major': profile_data.get('Major', 'N/A'),
+        'standing': profile_data.get('AcademicStanding', 'N/A'),
+        'analysis_summary': profile_data['analysis_summary'],
+        'strong_subjects': ', '.join(profile_data['strong_subjects']),
+        'interests': ', '.join(profile_data['interests']),
+        'career_goals': profile_data['career_goals'],
+        'preferred_difficulty': profile_data['preferred_difficulty'],
+        'course_recommendations_html': recommendation_cards(recommendations_data),
+        'prerequisites_html': prerequisite_items(recommendations_data),
+    }
+
+def stream_report(out, profile_data, recommendations_data):
+    """Write the report HTML to a file-like object section by section"""
+    REPORT_TEMPLATE.write(out, report_fields(profile_data, recommendations_data))
+
+def render_report(profile_data, recommendations_data):
+    return REPORT_TEMPLATE.render(report_fields(profile_data, recommendations_data))
+
+# --- 3. Write Final HTML ---
+# Bump when the template or rendering changes, so existing reports stop matching
+REPORT_FORMAT = 1
+
+# Report versions kept per student, the current one included
+REPORT_RETENTION = 3
+
+MANIFEST_FILENAME = 'report_manifest.json'
+
+def report_digest(profile_data, recommendations_data):
+    """Content hash of a report's inputs; equal digests render identical reports"""
+    payload = json.dumps({'format': REPORT_FORMAT, 'profile': profile_data, 'recommendations': recommendations_data},
+                         sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def _report_paths(output_dir, student_id):
+    """Existing report files for a student, newest first"""
+    paths = glob.glob(os.path.join(glob.escape(output_dir), f"recommendation_report_{student_id}_*.html"))
+    return sorted(paths, key=os.path.getmtime, reverse=True)
+
+def find_report(output_dir, student_id, digest):
+    """Path of an existing report rendered from inputs with this digest, or None"""
+    for path in _report_paths(output_dir, student_id):
+        if path.endswith(f"_{digest}.html"):
+            return path
+    return None
+
+def prune_reports(output_dir, student_id, current_path, keep=REPORT_RETENTION):
+    """Delete all but the newest keep reports for a student, never the current one; returns the deleted paths"""
+    older = [path for path in _report_paths(output_dir, student_id)
+             if os.path.abspath(path) != os.path.abspath(current_path)]
+    removed = []
+    for path in older[max(keep - 1, 0):]:
+        try:
+            os.remove(path)
+            removed.append(path)
+        except FileNotFoundError:
+            pass
+    return removed
+
+def generate_report(profile_data, recommendations_data, output_dir, keep=REPORT_RETENTION, force=False):
+    """Render the report unless one for identical inputs already exists, then apply the retention policy.
+
+    Returns {student_id, report_path, digest, reused, pruned}.
+    """
+    student_id = profile_data['student_id']
+    digest = report_digest(profile_data, recommendations_data)
+    output_filename = None if force else find_report(output_dir, student_id, digest)
+    reused = output_filename is not None
+
+    if not reused:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        output_filename = f"{output_dir}/recommendation_report_{student_id}_{timestamp}_{digest}.html"
+        # Written under a temporary name so an interrupted run never leaves a partial report that matches the digest
+        tmp_path = f"{output_filename}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            stream_report(f, profile_data, recommendations_data)
+        os.replace(tmp_path, output_filename)
+
+    pruned = prune_reports(output_dir, student_id, output_filename, keep) if keep else []
+    return {
+        "student_id": student_id,
+        "report_path": output_filename,
+        "digest": digest,
+        "reused": reused,
+        "pruned": pruned,
+    }
+
+def write_report(profile_data, recommendations_data, output_dir):
+    """Path of the student's report for these inputs, rendering it only if it does not exist yet"""
+    return generate_report(profile_data, recommendations_data, output_dir)['report_path']
+
+def update_manifest(reports_dir, results):
+    """Record each successful result as its student's current report in reports/report_manifest.json.
+
+    Call from a single process (the parent in bulk runs), after the reports are written.
+    """
+    manifest_path = os.path.join(reports_dir, MANIFEST_FILENAME)
+    try:
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        manifest = {}
+
+    for result in results:
+        if result.get('status', 'success') != 'success' or not result.get('report_path'):
+            continue
+        manifest[str(result['student_id'])] = {
+            "report_path": os.path.relpath(result['report_path'], reports_dir).replace(os.sep, '/'),
+            "digest": result.get('digest'),
+            "updated_at": datetime.fromtimestamp(os.path.getmtime(result['report_path'])).isoformat(timespec='seconds'),
+        }
+
+    tmp_path = f"{manifest_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
+    return manifest_path
+
+# --- 4. Bulk Mode ---
+index_template = """
+<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Course Recommendation Reports</title>
+    <style>
+        body {{
+            font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, "Helvetica Neue", Arial, sans-serif;
+            color: #333;
+            background-color: #f8f9fa;
+            padding: 20px;
+        }}
+        .container {{
+            max-width: 900px;
+            margin: 0 auto;
+            background: #fff;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 4px 12px rgba(0,0,0,0.08);
+        }}
+        h1 {{
+            color: #1a2b4d;
+            border-bottom: 2px solid #e9ecef;
+            padding-bottom: 10px;
+        }}
+        table {{
+            width: 100%;
+            border-collapse: collapse;
+        }}
+        th, td {{
+            text-align: left;
+            padding: 8px;
+            border-bottom: 1px solid #dee2e6;
+        }}
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>Course Recommendation Reports</h1>
+        <p>{report_count} reports generated {generated_at}</p>
+        <table>
+            <tr><th>Student ID</th><th>Name</th><th>Major</th><th>Recommendations</th></tr>
+            {index_rows}
+        </table>
     </div>
+</body>
+</html>
+"""
+
+INDEX_TEMPLATE = CompiledTemplate(index_template)
+
+INDEX_ROW_TEMPLATE = CompiledTemplate(
+    "<tr><td><a href=\"{href}\">{student_id}</a></td><td>{student_name}</td><td>{major}</td><td>{total}</td></tr>\n")
+
+def _write_report_task(task):
+    """Worker entry point: render one student's report with this process's compiled templates"""
+    profile_data, recommendations_data, output_dir, keep, force = task
+    student_id = profile_data['student_id']
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+        report = generate_report(profile_data, recommendations_data, output_dir, keep, force)
+    except Exception as e:
+        return {
+            "student_id": student_id,
+            "status": "error",
+            "error": f"{type(e).__name__}: {e}",
+            "traceback": traceback.format_exc(),
+        }
+    return {
+        "student_id": student_id,
+        "status": "success",
+        **report,
+        "student_name": f"{profile_data.get('FirstName', '')} {profile_data.get('LastName', '')}".strip(),
+        "major": profile_data.get('Major', 'N/A'),
+        "total_recommendations": recommendations_data.get('total_recommendations',
+                                                          len(recommendations_data['recommendations'])),
+    }
+
+def write_reports(students, reports_dir='reports', workers=None, chunksize=16, keep=REPORT_RETENTION, force=False):
+    """Render reports for many students from in-memory data.
+
+    students is an iterable of (profile_data, recommendations_data) pairs.
+    Each report goes to reports/{student_id}/ as in single-student mode.
+    With workers > 1 the reports are rendered on a process pool; each worker
+    reuses the compiled templates for every student it is given. Students
+    whose inputs are unchanged since their last report keep that report.
+    A failure for one student is recorded in its result and does not stop
+    the run. Returns one result dict per student, in input order; pass them
+    to update_manifest() from this process.
     """
+    tasks = [(profile_data, recommendations_data, os.path.join(reports_dir, str(profile_data['student_id'])), keep, force)
+             for profile_data, recommendations_data in students]
+    if workers is not None and workers <= 1:
+        return [_write_report_task(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(_write_report_task, tasks, chunksize=chunksize))
+
+def write_report_index(results, index_path):
+    """Index page linking every successfully generated report; returns its path"""
+    index_dir = os.path.dirname(os.path.abspath(index_path))
+    reports = [r for r in results if r['status'] == 'success' and r.get('report_path')]
+    rows = (INDEX_ROW_TEMPLATE.render({
+        'href': html.escape(os.path.relpath(os.path.abspath(r['report_path']), index_dir).replace(os.sep, '/')),
+        'student_id': r['student_id'],
+        'student_name': html.escape(r.get('student_name', '')),
+        'major': html.escape(str(r.get('major', 'N/A'))),
+        'total': r.get('total_recommendations', ''),
+    }) for r in reports)
+
+    with open(index_path, 'w', encoding='utf-8') as f:
+        INDEX_TEMPLATE.write(f, {
+            'report_count': len(reports),
+            'generated_at': datetime.now().strftime("%Y-%m-%d %H:%M"),
+            'index_rows': rows,
+        })
+    return index_path
+
+def load_report_inputs(student_id, reports_dir='reports'):
+    """Read profile_output.json and recommendations.json for a student"""
+    student_dir = os.path.join(reports_dir, str(student_id))
+    with open(os.path.join(student_dir, 'profile_output.json'), 'r') as f:
+        profile_data = json.load(f)
+    with open(os.path.join(student_dir, 'recommendations.json'), 'r', encoding='utf-8') as f:
+        recommendations_data = json.load(f)
+    return profile_data, recommendations_data
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate HTML recommendation reports")
+    parser.add_argument('student_ids', nargs='+', help="One or more student IDs")
+    parser.add_argument('--reports-dir', default='reports')
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes for bulk rendering (default 1: render in this process)")
+    parser.add_argument('--index', help="Also write an index page linking every report to this path")
+    parser.add_argument('--keep', type=int, default=REPORT_RETENTION,
+                        help="Report versions kept per student (0 keeps all)")
+    parser.add_argument('--force', action='store_true', help="Render again even if the inputs are unchanged")
+    args = parser.parse_args()
+
+    if len(args.student_ids) == 1 and not args.index:
+        student_id = args.student_ids[0]
+        profile_data, recommendations_data = load_report_inputs(student_id, args.reports_dir)
+        report = generate_report(profile_data, recommendations_data, os.path.join(args.reports_dir, student_id),
+                                 args.keep, args.force)
+        update_manifest(args.reports_dir, [report])
+        if report['reused']:
+            print(f"Report is up to date: {report['report_path']}")
+        else:
+            print(f"Report generated successfully: {report['report_path']}")
+        return
+
+    started = time.perf_counter()
+    students = []
+    for student_id in args.student_ids:
+        try:
+            students.append(load_report_inputs(student_id, args.reports_dir))
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"  Student {student_id}: skipped ({type(e).__name__}: {e})")
+
+    results = write_reports(students, args.reports_dir, args.workers, keep=args.keep, force=args.force)
+    update_manifest(args.reports_dir, results)
+    failures = [r for r in results if r['status'] == 'error']
+    reused = sum(1 for r in results if r.get('reused'))
+    print(f"Processed {len(results)} reports in {time.perf_counter() - started:.2f}s: "
+          f"{len(results) - len(failures) - reused} generated, {reused} up to date, {len(failures)} failed")
+    for failure in failures:
+        print(f"  Student {failure['student_id']}: {failure['error']}")
+    if args.index:
+        print(f"Index: {write_report_index(results, args.index)}")
 
-# Prerequisite Roadmap
-prereqs_html = "<ul class='prereq-list'>"
-if recommendations_data['prerequisites_to_prioritize']:
-    for prereq in recommendations_data['prerequisites_to_prioritize']:
-        prereqs_html += f"<li><code>{prereq['course_code']}</code> - {prereq['reason']}</li>"
-else:
-    prereqs_html += "<li>No prerequisites need to be prioritized at this time. You are eligible for your top recommendations!</li>"
-prereqs_html += "</ul>"
-
-
-# --- 4. Populate and Write Final HTML ---
-final_html = html_template.format(
-    student_id=profile_data['student_id'],
-    student_name=f"{profile_data.get('FirstName', '')} {profile_data.get('LastName', '')}".strip(),
-    gpa=profile_data['gpa'],
-    major=profile_data.get('Major', 'N/A'),
-    standing=profile_data.get('AcademicStanding', 'N/A'),
-    analysis_summary=profile_data['analysis_summary'],
-    strong_subjects=', '.join(profile_data['strong_subjects']),
-    interests=', '.join(profile_data['interests']),
-    career_goals=profile_data['career_goals'],
-    preferred_difficulty=profile_data['preferred_difficulty'],
-    course_recommendations_html=course_recs_html,
-    prerequisites_html=prereqs_html
-)
-
-timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-output_filename = f"reports/{student_id}/recommendation_report_{profile_data['student_id']}_{timestamp}.html"
-
-with open(output_filename, 'w', encoding='utf-8') as f:
-    f.write(final_html)
-
-print(f"Report generated successfully: {output_filename}")
\ No newline at end of file
+if __name__ == '__main__':
+    main()
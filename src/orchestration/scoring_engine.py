@@ -0,0 +1,257 @@
+"""
+Vectorized relevance scoring for the Course Matcher.
+
+CourseScoringEngine precomputes a course-by-keyword match matrix for a catalog
+once and then scores every course for one student, or a whole cohort as a
+student-by-course matrix, with NumPy array operations. The weights are the
+same 40/30/20/10 as course_matcher.calculate_relevance_score.
+"""
+
+import heapq
+from collections import OrderedDict
+
+import numpy as np
+
+from course_index import CourseIndex
+from keyword_matcher import KeywordMatcher
+
+INTEREST_WEIGHT = 40
+CAREER_WEIGHT = 30
+DIFFICULTY_WEIGHT = 20
+STRATEGIC_WEIGHT = 10
+
+TOP_K = 12
+
+# Keyword match columns kept per engine, least recently used evicted first
+MAX_KEYWORD_COLUMNS = 1024
+
+GENERAL_CAREER_KEYWORDS = [
+    "finance", "financial", "investment", "investments", "banking", "corporate", "valuation",
+    "mergers", "acquisitions", "computer science", "programming", "data structures", "algorithms",
+]
+
+
+def difficulty_match_score(difficulty_diff):
+    """Difficulty Match criterion for an absolute level difference (scalar or array)"""
+    return np.select(
+        [difficulty_diff == 0, difficulty_diff == 1, difficulty_diff == 2],
+        [1.0, 0.7, 0.4],
+        default=0.1,
+    )
+
+
+def course_text(course):
+    return (course['CourseName'] + ' ' + course['Description'] + ' ' + course['DepartmentName']).lower()
+
+
+class CourseScoringEngine:
+    """Scores a whole course catalog against a student profile in one pass"""
+
+    def __init__(self, courses, course_texts=None, prerequisite_ids=None, course_tokens=None, term_tables=None):
+        self.courses = courses
+        self.course_texts = course_texts if course_texts is not None else [course_text(c) for c in courses]
+        self.difficulty = np.array([c.get('DifficultyLevel', 1) for c in courses], dtype=float)
+        if prerequisite_ids is None:
+            prerequisite_ids = [
+                tuple(int(p) for p in c['PrerequisiteCourseIDs'].split(',')) if c['PrerequisiteCourseIDs'] else ()
+                for c in courses
+            ]
+        self.prerequisite_ids = prerequisite_ids
+
+        department_names = [c['DepartmentName'] for c in courses]
+        self.department_codes = {name: code for code, name in enumerate(dict.fromkeys(department_names))}
+        self.department_ids = np.array([self.department_codes[name] for name in department_names], dtype=np.int32)
+
+        # Rank of each course by CourseCode, for deterministic tie-breaking in top_k
+        self.code_rank = [0] * len(courses)
+        for rank, i in enumerate(sorted(range(len(courses)), key=lambda i: courses[i]['CourseCode'])):
+            self.code_rank[i] = rank
+
+        self._keyword_columns = OrderedDict()
+        self.general_keyword_matrix = self.keyword_matrix(GENERAL_CAREER_KEYWORDS)
+        self.general_keyword_hits = self.general_keyword_matrix.any(axis=1)
+
+        self.index = CourseIndex(self.course_texts, course_tokens, self.department_ids, self.difficulty, self.code_rank,
+                                 term_tables)
+
+    @classmethod
+    def from_feature_store(cls, store):
+        """Engine over a course_features.CourseFeatureStore, reusing its precomputed text, tokens and term tables"""
+        return cls(store.courses, store.texts, store.prerequisite_ids, store.tokens, store.term_tables)
+
+    def __len__(self):
+        return len(self.courses)
+
+    def keyword_column(self, keyword):
+        """Boolean vector of courses whose text contains the (lowercase) keyword"""
+        return self._columns_for([keyword])[keyword]
+
+    def keyword_matrix(self, keywords):
+        """Course-by-keyword boolean match matrix"""
+        columns = self._columns_for(keywords)
+        matrix = np.zeros((len(self), len(keywords)), dtype=bool)
+        for j, keyword in enumerate(keywords):
+            matrix[:, j] = columns[keyword]
+        return matrix
+
+    def _columns_for(self, keywords):
+        """{keyword: match column} for the keywords, scanning the catalog once for those not cached"""
+        columns = {}
+        missing = []
+        for keyword in dict.fromkeys(keywords):
+            column = self._keyword_columns.get(keyword)
+            if column is None:
+                missing.append(keyword)
+            else:
+                self._keyword_columns.move_to_end(keyword)
+                columns[keyword] = column
+        if missing:
+            columns.update(self._scan_keywords(missing))
+        return columns
+
+    def _scan_keywords(self, keywords):
+        # One multi-pattern pass over each course text fills every new keyword column
+        matcher = KeywordMatcher(keywords)
+        columns = {keyword: np.zeros(len(self), dtype=bool) for keyword in matcher.keywords}
+        for i, text in enumerate(self.course_texts):
+            for keyword in matcher.find(text):
+                columns[keyword][i] = True
+        self._keyword_columns.update(columns)
+        while len(self._keyword_columns) > MAX_KEYWORD_COLUMNS:
+            self._keyword_columns.popitem(last=False)
+        return columns
+
+    def score_matrix(self, student_profiles, indices=None):
+        """Student-by-course matrix of final 0-100 relevance scores, rounded to 2 places
+
+        With indices, only those courses (columns) are scored, with keyword hits
+        looked up in the inverted index instead of the dense keyword columns.
+        """
+        n_students = len(student_profiles)
+        if indices is None:
+            n_courses = len(self)
+            difficulty = self.difficulty
+            department_ids = self.department_ids
+            general_keyword_hits = self.general_keyword_hits
+        else:
+            n_courses = len(indices)
+            difficulty = self.difficulty[indices]
+            department_ids = self.department_ids[indices]
+            general_keyword_hits = self.general_keyword_hits[indices]
+
+        # Every keyword any of these students matches on, scanned once per catalog
+        vocabulary = {}
+        for profile in student_profiles:
+            for interest in profile['interests']:
+                vocabulary.setdefault(interest.lower(), len(vocabulary))
+            if profile['career_goals']:
+                vocabulary.setdefault(profile['career_goals'].lower(), len(vocabulary))
+            if profile.get('Major'):
+                vocabulary.setdefault(profile['Major'].lower(), len(vocabulary))
+        if indices is None:
+            keyword_hits = self.keyword_matrix(list(vocabulary))
+        else:
+            keyword_hits = np.zeros((n_courses, len(vocabulary)), dtype=bool)
+            for keyword, j in vocabulary.items():
+                keyword_hits[:, j] = np.isin(indices, self.index.keyword_postings(keyword), assume_unique=True)
+        keyword_hits = np.hstack([keyword_hits.astype(np.float64), np.zeros((n_courses, 1))])  # column -1: no keyword
+
+        # 1. Interest Alignment: integer hit counts / number of interests
+        interest_counts = np.zeros((n_students, len(vocabulary) + 1))
+        interest_totals = np.zeros(n_students)
+        for s, profile in enumerate(student_profiles):
+            for interest in profile['interests']:
+                interest_counts[s, vocabulary[interest.lower()]] += 1
+            interest_totals[s] = len(profile['interests'])
+        interest_hits = interest_counts @ keyword_hits.T
+        interest_score = np.divide(interest_hits, interest_totals[:, None],
+                                   out=np.zeros_like(interest_hits), where=interest_totals[:, None] > 0)
+
+        # 2. Career Relevance: career goal hit, otherwise general career keywords
+        career_columns = [vocabulary[p['career_goals'].lower()] if p['career_goals'] else -1 for p in student_profiles]
+        career_hits = keyword_hits[:, career_columns].T > 0
+        career_relevance = np.where(career_hits, 1.0, np.where(general_keyword_hits, 0.7, 0.0))
+
+        # 3. Difficulty Match
+        preferred = np.array([p['preferred_difficulty'] for p in student_profiles], dtype=float)
+        difficulty_match = difficulty_match_score(np.abs(difficulty[None, :] - preferred[:, None]))
+
+        # 4. Strategic Value: strong subject department, then major mentioned in course text
+        strong_departments = np.zeros((n_students, len(self.department_codes)), dtype=bool)
+        for s, profile in enumerate(student_profiles):
+            for name in profile['strong_subjects']:
+                if name in self.department_codes:
+                    strong_departments[s, self.department_codes[name]] = True
+        major_columns = [vocabulary[p['Major'].lower()] if p.get('Major') else -1 for p in student_profiles]
+        major_hits = keyword_hits[:, major_columns].T > 0
+        strategic_value = np.where(strong_departments[:, department_ids], 0.6, 0.0)
+        strategic_value = strategic_value + np.where(major_hits, 0.4, 0.0)
+
+        score = interest_score * INTEREST_WEIGHT
+        score = score + career_relevance * CAREER_WEIGHT
+        score = score + difficulty_match * DIFFICULTY_WEIGHT
+        score = score + strategic_value * STRATEGIC_WEIGHT
+        return np.round(np.minimum(score, 100.0), 2)
+
+    def score(self, student_profile):
+        """Final 0-100 relevance scores for every course for one student"""
+        return self.score_matrix([student_profile])[0]
+
+    def score_candidates(self, student_profile):
+        """(indices, scores) for the courses hitting any of the student's keywords or strong subjects"""
+        keywords = [i.lower() for i in student_profile['interests']] + GENERAL_CAREER_KEYWORDS
+        if student_profile['career_goals']:
+            keywords.append(student_profile['career_goals'].lower())
+        if student_profile.get('Major'):
+            keywords.append(student_profile['Major'].lower())
+        departments = [self.department_codes[n] for n in student_profile['strong_subjects'] if n in self.department_codes]
+        candidates = self.index.candidates(keywords, departments)
+        return candidates, self.score_matrix([student_profile], candidates)[0]
+
+    def match_top_k(self, student_profile, k=TOP_K, course_mask=None):
+        """Top k (index, score) pairs, fully scoring only the index candidates
+
+        Every other course scores on difficulty alone, which is the same for all
+        courses at a difficulty level, so only the first k non-candidates of each
+        level (in CourseCode order) can reach the top k. course_mask, a boolean
+        vector over the catalog, restricts the result (e.g. to eligible courses).
+        """
+        candidates, scores = self.score_candidates(student_profile)
+        if course_mask is not None:
+            keep = course_mask[candidates]
+            candidates, scores = candidates[keep], scores[keep]
+        candidate_set = set(candidates.tolist())
+        indices = [candidates]
+        all_scores = [scores]
+        for level, group in self.index.difficulty_groups.items():
+            floor_indices = []
+            for i in group:
+                if i not in candidate_set and (course_mask is None or course_mask[i]):
+                    floor_indices.append(i)
+                    if len(floor_indices) == k:
+                        break
+            floor = difficulty_match_score(abs(level - student_profile['preferred_difficulty'])) * DIFFICULTY_WEIGHT
+            indices.append(np.array(floor_indices, dtype=np.int64))
+            all_scores.append(np.full(len(floor_indices), np.round(min(floor, 100.0), 2)))
+        return self.top_k(np.concatenate(all_scores), k, np.concatenate(indices))
+
+    def top_k(self, scores, k=TOP_K, indices=None):
+        """(course index, score) of the k best-scoring courses, best first; ties go to the lower CourseCode
+
+        scores covers the whole catalog, or the courses in indices when given.
+        """
+        if k <= 0:
+            return []
+        if indices is None:
+            indices = range(len(scores))
+        else:
+            indices = indices.tolist()
+        code_rank = self.code_rank
+        heap = []  # min-heap of (score, -code_rank, index): root is the weakest survivor
+        for i, score in zip(indices, scores.tolist()):
+            entry = (score, -code_rank[i], i)
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry > heap[0]:
+                heapq.heapreplace(heap, entry)
+        return [(i, score) for score, _, i in sorted(heap, reverse=True)]
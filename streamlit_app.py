@@ -4,12 +4,26 @@ Provides a modern web interface for students to view course data
 """
 
 import streamlit as st
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+import atexit
+import functools
 import json
+import os
+import re
+import sys
+
+# Shared helpers live alongside the orchestration scripts
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'orchestration'))
+
+from connection_pool import ConnectionPool
+from course_bundle import load_course_bundles
+from data_access import fetch_all, fetch_one, fetch_value
+from figure_cache import FigureCache
+from prerequisite_index import load_prerequisite_index
+from query_cache import QueryCache
 
 # ============================================================================
 # PAGE CONFIGURATION
@@ -47,18 +61,69 @@ st.markdown("""
 # DATABASE CONNECTION
 # ============================================================================
 
-def get_db_connection():
-    """Create database connection (do NOT cache for SQLite threading issues)"""
-    conn = sqlite3.connect('sqlite_database.db', check_same_thread=False)
-    conn.row_factory = sqlite3.Row
-    return conn
+DB_PATH = 'sqlite_database.db'
+
+@st.cache_resource
+def get_connection_pool():
+    """Read-only connection pool shared by every session; each rerun leases one connection"""
+    pool = ConnectionPool(DB_PATH)
+    atexit.register(pool.close)
+    return pool
+
+@st.cache_resource
+def get_query_cache():
+    """Lookup query results shared across sessions, dropped on TTL expiry or any database change"""
+    return QueryCache(ttl=600)
+
+@st.cache_resource
+def get_figure_cache():
+    """Built chart figures shared across sessions, keyed by a hash of their data"""
+    return FigureCache()
+
+def cached_query(query_function):
+    """Serve a query function's results from the shared query cache"""
+    @functools.wraps(query_function)
+    def wrapper(conn, *args):
+        return get_query_cache().fetch(conn, query_function, *args)
+    return wrapper
 
 # ============================================================================
 # QUERY FUNCTIONS
 # ============================================================================
 
-def get_all_courses(conn):
-    """Fetch all active courses with department and difficulty info"""
+@cached_query
+def has_table(conn, table_name):
+    """Whether an optional table (full-text index, statistics tables) has been created"""
+    row = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table_name,)).fetchone()
+    return row is not None
+
+def has_statistics_tables(conn):
+    """Whether 07_DDL_course_statistics_v1.sql has created the summary tables"""
+    return has_table(conn, 'CourseStatsByDepartment')
+
+# Courses shown per Course Browser page
+BROWSER_PAGE_SIZE = 20
+
+# Course Browser filters; a NULL ID means no filter on that column
+COURSE_FILTER_CLAUSE = """
+    WHERE c.Status = 'Active'
+      AND (? IS NULL OR c.DepartmentID = ?)
+      AND (? IS NULL OR c.DifficultyLevelID = ?)
+      AND (? IS NULL OR c.InstructionModeID = ?)
+"""
+
+@cached_query
+def count_courses(conn, department_id=None, difficulty_level_id=None, instruction_mode_id=None):
+    """Count active courses matching the browser filters"""
+    query = "SELECT COUNT(*) FROM Courses c" + COURSE_FILTER_CLAUSE
+    params = (department_id, department_id, difficulty_level_id, difficulty_level_id,
+              instruction_mode_id, instruction_mode_id)
+    return conn.execute(query, params).fetchone()[0]
+
+@cached_query
+def get_courses_page(conn, department_id=None, difficulty_level_id=None, instruction_mode_id=None,
+                     limit=BROWSER_PAGE_SIZE, offset=0):
+    """Fetch one page of active courses matching the browser filters, in course code order"""
     query = """
     SELECT 
         c.CourseID,
@@ -75,76 +140,32 @@ def get_all_courses(conn):
     LEFT JOIN Departments d ON c.DepartmentID = d.DepartmentID
     LEFT JOIN DifficultyLevels dl ON c.DifficultyLevelID = dl.DifficultyLevelID
     LEFT JOIN InstructionModes im ON c.InstructionModeID = im.InstructionModeID
-    WHERE c.Status = 'Active'
+    """ + COURSE_FILTER_CLAUSE + """
     ORDER BY c.CourseCode
+    LIMIT ? OFFSET ?
     """
-    return pd.read_sql_query(query, conn)
+    params = (department_id, department_id, difficulty_level_id, difficulty_level_id,
+              instruction_mode_id, instruction_mode_id, limit, offset)
+    return fetch_all(conn, query, params)
 
-def get_course_details(conn, course_id):
-    """Fetch detailed information about a specific course"""
-    query = """
-    SELECT 
-        c.CourseID,
-        c.CourseCode,
-        c.CourseName,
-        c.Description,
-        c.CreditHours,
-        c.LearningOutcomes,
-        d.DepartmentName,
-        dl.LevelName as DifficultyLevel,
-        im.ModeName as InstructionMode,
-        c.MaxEnrollment,
-        c.Status,
-        c.SyllabusURL
-    FROM Courses c
-    LEFT JOIN Departments d ON c.DepartmentID = d.DepartmentID
-    LEFT JOIN DifficultyLevels dl ON c.DifficultyLevelID = dl.DifficultyLevelID
-    LEFT JOIN InstructionModes im ON c.InstructionModeID = im.InstructionModeID
-    WHERE c.CourseID = ?
-    """
-    result = pd.read_sql_query(query, conn, params=(course_id,))
-    return result.iloc[0] if not result.empty else None
+@cached_query
+def get_prerequisite_index(conn):
+    """Prerequisite lookup index shared across sessions (catalog changes rarely)"""
+    return load_prerequisite_index(conn)
 
-def get_course_prerequisites(conn, course_id):
-    """Fetch prerequisites for a course"""
-    query = """
-    SELECT 
-        pc.CourseCode as PrerequisiteCourseCode,
-        pc.CourseName as PrerequisiteCourseName,
-        p.MinimumGrade,
-        p.PrerequisiteType,
-        p.Notes
-    FROM Prerequisites p
-    JOIN Courses pc ON p.PrerequisiteCourseID = pc.CourseID
-    WHERE p.CourseID = ?
-    ORDER BY p.PrerequisiteType DESC
-    """
-    return pd.read_sql_query(query, conn, params=(course_id,))
+def fetch_course_bundles(conn, course_ids):
+    """Load details, prerequisites and schedules for several courses in one query"""
+    return load_course_bundles(conn, course_ids, get_prerequisite_index(conn))
 
-def get_course_schedules(conn, course_id):
-    """Fetch all schedules for a course"""
-    query = """
-    SELECT 
-        s.ScheduleID,
-        s.Semester,
-        s.SectionNumber,
-        s.ProfessorName,
-        s.MeetingDays,
-        s.StartTime,
-        s.EndTime,
-        s.Location,
-        im.ModeName as InstructionMode,
-        s.EnrollmentStatus,
-        s.CurrentEnrollment,
-        s.MaxCapacity,
-        s.WaitListCount
-    FROM Schedules s
-    LEFT JOIN InstructionModes im ON s.InstructionModeID = im.InstructionModeID
-    WHERE s.CourseID = ?
-    ORDER BY s.Semester DESC, s.SectionNumber
-    """
-    return pd.read_sql_query(query, conn, params=(course_id,))
+def get_course_bundles(conn, course_ids):
+    """Course bundles by CourseID, cached per course; only uncached courses are queried"""
+    return get_query_cache().fetch_many(conn, fetch_course_bundles, [int(course_id) for course_id in course_ids])
+
+def get_course_bundle(conn, course_id):
+    """Details, prerequisites and schedules of one course, or None if it does not exist"""
+    return get_course_bundles(conn, [course_id])[int(course_id)]
 
+@cached_query
 def get_departments(conn):
     """Fetch all departments"""
     query = """
@@ -157,7 +178,7 @@ def get_departments(conn):
     WHERE IsActive = 1
     ORDER BY DepartmentName
     """
-    return pd.read_sql_query(query, conn)
+    return fetch_all(conn, query)
 
 def get_courses_by_department(conn, department_id):
     """Fetch courses by department"""
@@ -176,24 +197,36 @@ def get_courses_by_department(conn, department_id):
     """
     return pd.read_sql_query(query, conn, params=(department_id,))
 
+@cached_query
 def get_difficulty_levels(conn):
     """Fetch all difficulty levels"""
     query = """
     SELECT * FROM DifficultyLevels
     ORDER BY DisplayOrder
     """
-    return pd.read_sql_query(query, conn)
+    return fetch_all(conn, query)
 
+@cached_query
 def get_instruction_modes(conn):
     """Fetch all instruction modes"""
     query = """
     SELECT * FROM InstructionModes
     ORDER BY DisplayOrder
     """
-    return pd.read_sql_query(query, conn)
+    return fetch_all(conn, query)
 
+@cached_query
 def get_courses_statistics(conn):
     """Fetch course statistics"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            (SELECT COALESCE(SUM(ActiveCourseCount), 0) FROM CourseStatsByCreditHours) as total_active_courses,
+            (SELECT COUNT(*) FROM CourseStatsByDepartment WHERE ActiveCourseCount > 0) as total_departments,
+            (SELECT SUM(CreditHours * ActiveCourseCount) * 1.0 / SUM(ActiveCourseCount) FROM CourseStatsByCreditHours) as avg_credit_hours,
+            (SELECT COUNT(*) FROM CourseStatsByMode WHERE CourseCount > 0) as instruction_modes
+        """
+        return fetch_one(conn, query)
     query = """
     SELECT 
         (SELECT COUNT(*) FROM Courses WHERE Status = 'Active') as total_active_courses,
@@ -201,11 +234,21 @@ def get_courses_statistics(conn):
         (SELECT AVG(CreditHours) FROM Courses WHERE Status = 'Active') as avg_credit_hours,
         (SELECT COUNT(DISTINCT InstructionModeID) FROM Courses) as instruction_modes
     """
-    result = pd.read_sql_query(query, conn)
-    return result.iloc[0] if not result.empty else None
+    return fetch_one(conn, query)
 
+@cached_query
 def get_courses_by_difficulty(conn):
     """Get course distribution by difficulty level"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            dl.LevelName as DifficultyLevel,
+            COALESCE(s.ActiveCourseCount, 0) as CourseCount
+        FROM DifficultyLevels dl
+        LEFT JOIN CourseStatsByDifficulty s ON dl.DifficultyLevelID = s.DifficultyLevelID
+        ORDER BY dl.DisplayOrder
+        """
+        return pd.read_sql_query(query, conn)
     query = """
     SELECT 
         dl.LevelName as DifficultyLevel,
@@ -217,8 +260,19 @@ def get_courses_by_difficulty(conn):
     """
     return pd.read_sql_query(query, conn)
 
+@cached_query
 def get_courses_by_instruction_mode(conn):
     """Get course distribution by instruction mode"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            im.ModeName as InstructionMode,
+            COALESCE(s.ActiveCourseCount, 0) as CourseCount
+        FROM InstructionModes im
+        LEFT JOIN CourseStatsByMode s ON im.InstructionModeID = s.InstructionModeID
+        ORDER BY im.DisplayOrder
+        """
+        return pd.read_sql_query(query, conn)
     query = """
     SELECT 
         im.ModeName as InstructionMode,
@@ -230,8 +284,160 @@ def get_courses_by_instruction_mode(conn):
     """
     return pd.read_sql_query(query, conn)
 
+@cached_query
+def get_statistics_overview(conn):
+    """Catalog and schedule totals for the Statistics page"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            (SELECT COALESCE(SUM(ActiveCourseCount), 0) FROM CourseStatsByCreditHours) as total_courses,
+            (SELECT COUNT(*) FROM CourseStatsByDepartment WHERE CourseCount > 0) as total_depts,
+            (SELECT COALESCE(SUM(SectionCount), 0) FROM SemesterEnrollment) as total_schedules,
+            (SELECT COUNT(*) FROM SemesterEnrollment WHERE SectionCount > 0) as semesters,
+            (SELECT SUM(CreditHours * ActiveCourseCount) * 1.0 / SUM(ActiveCourseCount) FROM CourseStatsByCreditHours) as avg_credits,
+            (SELECT SUM(TotalCapacity) FROM SemesterEnrollment) as total_capacity
+        """
+    else:
+        query = """
+        SELECT 
+            (SELECT COUNT(*) FROM Courses WHERE Status = 'Active') as total_courses,
+            (SELECT COUNT(DISTINCT DepartmentID) FROM Courses) as total_depts,
+            (SELECT COUNT(*) FROM Schedules) as total_schedules,
+            (SELECT COUNT(DISTINCT Semester) FROM Schedules) as semesters,
+            (SELECT AVG(CreditHours) FROM Courses WHERE Status = 'Active') as avg_credits,
+            (SELECT SUM(MaxCapacity) FROM Schedules) as total_capacity
+        """
+    return fetch_one(conn, query)
+
+@cached_query
+def get_department_distribution(conn):
+    """Get active course counts per active department, largest first"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            d.DepartmentName,
+            COALESCE(s.ActiveCourseCount, 0) as CourseCount
+        FROM Departments d
+        LEFT JOIN CourseStatsByDepartment s ON d.DepartmentID = s.DepartmentID
+        WHERE d.IsActive = 1
+        ORDER BY CourseCount DESC
+        """
+    else:
+        query = """
+        SELECT 
+            d.DepartmentName,
+            COUNT(c.CourseID) as CourseCount
+        FROM Departments d
+        LEFT JOIN Courses c ON d.DepartmentID = c.DepartmentID AND c.Status = 'Active'
+        WHERE d.IsActive = 1
+        GROUP BY d.DepartmentID, d.DepartmentName
+        ORDER BY CourseCount DESC
+        """
+    return pd.read_sql_query(query, conn)
+
+@cached_query
+def get_credit_hours_distribution(conn):
+    """Get active course counts per credit hours value"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            CreditHours,
+            ActiveCourseCount as CourseCount
+        FROM CourseStatsByCreditHours
+        WHERE ActiveCourseCount > 0
+        ORDER BY CreditHours
+        """
+    else:
+        query = """
+        SELECT 
+            CreditHours,
+            COUNT(*) as CourseCount
+        FROM Courses
+        WHERE Status = 'Active'
+        GROUP BY CreditHours
+        ORDER BY CreditHours
+        """
+    return pd.read_sql_query(query, conn)
+
+@cached_query
+def get_semester_enrollment(conn):
+    """Get enrollment and capacity for the 10 latest semesters"""
+    if has_statistics_tables(conn):
+        query = """
+        SELECT 
+            Semester,
+            TotalEnrolled,
+            TotalCapacity
+        FROM SemesterEnrollment
+        WHERE SectionCount > 0
+        ORDER BY Semester DESC
+        LIMIT 10
+        """
+    else:
+        query = """
+        SELECT 
+            Semester,
+            SUM(CurrentEnrollment) as TotalEnrolled,
+            SUM(MaxCapacity) as TotalCapacity
+        FROM Schedules
+        GROUP BY Semester
+        ORDER BY Semester DESC
+        LIMIT 10
+        """
+    return pd.read_sql_query(query, conn)
+
+# Most relevant matches shown on the Search page
+SEARCH_RESULT_LIMIT = 50
+
+def fts_match_expression(search_term):
+    """FTS5 query matching every word of the search term as a prefix, e.g. 'risk man' -> "risk"* "man"*"""
+    words = re.findall(r'\w+', search_term)
+    return ' '.join(f'"{word}"*' for word in words)
+
 def search_courses(conn, search_term):
-    """Search courses by code or name"""
+    """Full-text search over course code, name, description and learning outcomes, best matches first"""
+    match_expression = fts_match_expression(search_term)
+    # CourseSearch is created by 06_DDL_course_search_v1.sql
+    if not match_expression or not has_table(conn, 'CourseSearch'):
+        return search_courses_like(conn, search_term)
+    # bm25 column weights: code and name hits rank above description and learning outcome hits
+    query = """
+    SELECT 
+        c.CourseID,
+        c.CourseCode,
+        c.CourseName,
+        c.CreditHours,
+        d.DepartmentName,
+        dl.LevelName as DifficultyLevel,
+        c.Status,
+        snippet(CourseSearch, 2, '**', '**', '…', 16) as Snippet
+    FROM CourseSearch
+    JOIN Courses c ON c.CourseID = CourseSearch.rowid
+    LEFT JOIN Departments d ON c.DepartmentID = d.DepartmentID
+    LEFT JOIN DifficultyLevels dl ON c.DifficultyLevelID = dl.DifficultyLevelID
+    WHERE CourseSearch MATCH ?
+    AND c.Status = 'Active'
+    ORDER BY bm25(CourseSearch, 10.0, 5.0, 1.0, 1.0)
+    LIMIT ?
+    """
+    return fetch_all(conn, query, (match_expression, SEARCH_RESULT_LIMIT))
+
+def count_search_results(conn, search_term):
+    """Number of active courses matching the search, beyond the SEARCH_RESULT_LIMIT shown"""
+    match_expression = fts_match_expression(search_term)
+    if not match_expression or not has_table(conn, 'CourseSearch'):
+        return len(search_courses_like(conn, search_term))
+    query = """
+    SELECT COUNT(*)
+    FROM CourseSearch
+    JOIN Courses c ON c.CourseID = CourseSearch.rowid
+    WHERE CourseSearch MATCH ?
+    AND c.Status = 'Active'
+    """
+    return fetch_value(conn, query, (match_expression,))
+
+def search_courses_like(conn, search_term):
+    """Search courses by code or name (fallback when the full-text index is missing)"""
     query = """
     SELECT 
         c.CourseID,
@@ -249,13 +455,118 @@ def search_courses(conn, search_term):
     ORDER BY c.CourseCode
     """
     search_pattern = f"%{search_term}%"
-    return pd.read_sql_query(query, conn, params=(search_pattern, search_pattern))
+    return fetch_all(conn, query, (search_pattern, search_pattern))
+
+def lookup_id(records, name_field, id_field, name):
+    """ID for a name picked from a lookup list, None for the "All ..." option"""
+    return next((getattr(r, id_field) for r in records if getattr(r, name_field) == name), None)
+
+# ============================================================================
+# CHARTS
+# ============================================================================
+
+def cached_figure(build_figure, data):
+    """build_figure(data) from the shared figure cache; rebuilt only when the data changes"""
+    return get_figure_cache().get(build_figure.__name__, data, build_figure)
+
+def difficulty_chart(difficulty_data):
+    fig = px.bar(
+        difficulty_data,
+        x='DifficultyLevel',
+        y='CourseCount',
+        title='Courses by Difficulty Level',
+        color='CourseCount',
+        color_continuous_scale='Blues',
+        labels={'DifficultyLevel': 'Difficulty Level', 'CourseCount': 'Number of Courses'}
+    )
+    fig.update_layout(height=400, showlegend=False)
+    return fig
+
+def instruction_mode_chart(mode_data):
+    fig = px.pie(
+        mode_data,
+        names='InstructionMode',
+        values='CourseCount',
+        title='Courses by Instruction Mode'
+    )
+    fig.update_layout(height=400)
+    return fig
+
+def enrollment_status_chart(schedules):
+    status_counts = schedules['EnrollmentStatus'].value_counts()
+    return px.pie(
+        values=status_counts.values,
+        names=status_counts.index,
+        title='Schedule Enrollment Status',
+        color_discrete_map={
+            'Open': '#2ecc71',
+            'Full': '#e74c3c',
+            'Closed': '#95a5a6',
+            'Waitlist': '#f39c12'
+        }
+    )
+
+def overall_enrollment_chart(schedules):
+    total_enrolled = schedules['CurrentEnrollment'].sum()
+    total_capacity = schedules['MaxCapacity'].sum()
+    fig = go.Figure(data=[
+        go.Bar(name='Enrolled', x=['Total'], y=[total_enrolled]),
+        go.Bar(name='Available', x=['Total'], y=[total_capacity - total_enrolled])
+    ])
+    fig.update_layout(
+        title='Overall Enrollment',
+        barmode='stack',
+        height=400,
+        xaxis_title='',
+        yaxis_title='Students'
+    )
+    return fig
+
+def department_chart(dept_data):
+    fig = px.bar(
+        dept_data,
+        x='DepartmentName',
+        y='CourseCount',
+        title='Courses per Department',
+        labels={'DepartmentName': 'Department', 'CourseCount': 'Number of Courses'},
+        color='CourseCount',
+        color_continuous_scale='Blues'
+    )
+    fig.update_layout(height=400)
+    return fig
+
+def credit_hours_chart(credit_data):
+    fig = px.bar(
+        credit_data,
+        x='CreditHours',
+        y='CourseCount',
+        title='Course Distribution by Credit Hours',
+        labels={'CreditHours': 'Credit Hours', 'CourseCount': 'Number of Courses'},
+        color='CourseCount',
+        color_continuous_scale='Greens'
+    )
+    fig.update_layout(height=400)
+    return fig
+
+def semester_enrollment_chart(semester_data):
+    fig = go.Figure(data=[
+        go.Bar(name='Enrolled', x=semester_data['Semester'], y=semester_data['TotalEnrolled']),
+        go.Bar(name='Capacity', x=semester_data['Semester'], y=semester_data['TotalCapacity'])
+    ])
+    fig.update_layout(
+        title='Enrollment by Semester',
+        barmode='group',
+        height=400,
+        xaxis_title='Semester',
+        yaxis_title='Number of Students'
+    )
+    return fig
 
 # ============================================================================
 # PAGE: HOME
 # ============================================================================
 
-def page_home():
+def page_home(conn):
     """Home/Dashboard page"""
     col1, col2 = st.columns([3, 1])
     
@@ -264,22 +575,21 @@ def page_home():
     
     st.markdown("---")
     
-    conn = get_db_connection()
     stats = get_courses_statistics(conn)
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("📚 Active Courses", int(stats['total_active_courses']))
+        st.metric("📚 Active Courses", int(stats.total_active_courses))
     
     with col2:
-        st.metric("🏢 Departments", int(stats['total_departments']))
+        st.metric("🏢 Departments", int(stats.total_departments))
     
     with col3:
-        st.metric("⏱️ Avg Credit Hours", f"{stats['avg_credit_hours']:.1f}")
+        st.metric("⏱️ Avg Credit Hours", f"{stats.avg_credit_hours:.1f}")
     
     with col4:
-        st.metric("🎯 Instruction Modes", int(stats['instruction_modes']))
+        st.metric("🎯 Instruction Modes", int(stats.instruction_modes))
     
     st.markdown("---")
     
@@ -289,41 +599,22 @@ def page_home():
     with col1:
         difficulty_data = get_courses_by_difficulty(conn)
         if not difficulty_data.empty:
-            fig = px.bar(
-                difficulty_data,
-                x='DifficultyLevel',
-                y='CourseCount',
-                title='Courses by Difficulty Level',
-                color='CourseCount',
-                color_continuous_scale='Blues',
-                labels={'DifficultyLevel': 'Difficulty Level', 'CourseCount': 'Number of Courses'}
-            )
-            fig.update_layout(height=400, showlegend=False)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(difficulty_chart, difficulty_data), use_container_width=True)
     
     with col2:
         mode_data = get_courses_by_instruction_mode(conn)
         if not mode_data.empty:
-            fig = px.pie(
-                mode_data,
-                names='InstructionMode',
-                values='CourseCount',
-                title='Courses by Instruction Mode'
-            )
-            fig.update_layout(height=400)
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(instruction_mode_chart, mode_data), use_container_width=True)
 
 # ============================================================================
 # PAGE: COURSE BROWSER
 # ============================================================================
 
-def page_course_browser():
+def page_course_browser(conn):
     """Browse all courses"""
     st.markdown("## 📚 Course Browser")
     st.markdown("---")
     
-    conn = get_db_connection()
-    
     # Filter options
     col1, col2, col3 = st.columns(3)
     
@@ -331,7 +622,7 @@ def page_course_browser():
         departments = get_departments(conn)
         selected_dept = st.selectbox(
             "Filter by Department",
-            ["All Departments"] + departments['DepartmentName'].tolist(),
+            ["All Departments"] + [d.DepartmentName for d in departments],
             key="dept_filter"
         )
     
@@ -339,7 +630,7 @@ def page_course_browser():
         difficulties = get_difficulty_levels(conn)
         selected_difficulty = st.selectbox(
             "Filter by Difficulty",
-            ["All Levels"] + difficulties['LevelName'].tolist(),
+            ["All Levels"] + [d.LevelName for d in difficulties],
             key="diff_filter"
         )
     
@@ -347,59 +638,79 @@ def page_course_browser():
         modes = get_instruction_modes(conn)
         selected_mode = st.selectbox(
             "Filter by Instruction Mode",
-            ["All Modes"] + modes['ModeName'].tolist(),
+            ["All Modes"] + [m.ModeName for m in modes],
             key="mode_filter"
         )
     
     st.markdown("---")
     
-    # Get courses
-    courses_df = get_all_courses(conn)
+    # Filters run in SQL on the indexed ID columns
+    filters = (
+        lookup_id(departments, 'DepartmentName', 'DepartmentID', selected_dept),
+        lookup_id(difficulties, 'LevelName', 'DifficultyLevelID', selected_difficulty),
+        lookup_id(modes, 'ModeName', 'InstructionModeID', selected_mode),
+    )
+    total_courses = count_courses(conn, *filters)
+    page_count = max(1, -(-total_courses // BROWSER_PAGE_SIZE))
     
-    # Apply filters
-    if selected_dept != "All Departments":
-        courses_df = courses_df[courses_df['DepartmentName'] == selected_dept]
+    # Back to the first page whenever the filters change
+    if st.session_state.get("browser_filters") != filters:
+        st.session_state.browser_filters = filters
+        st.session_state.browser_page = 1
+    page_number = min(st.session_state.get("browser_page", 1), page_count)
     
-    if selected_difficulty != "All Levels":
-        courses_df = courses_df[courses_df['DifficultyLevel'] == selected_difficulty]
+    st.subheader(f"Found {total_courses} Courses")
     
-    if selected_mode != "All Modes":
-        courses_df = courses_df[courses_df['InstructionMode'] == selected_mode]
+    # Only the current page of courses is fetched and rendered
+    courses = get_courses_page(conn, *filters, BROWSER_PAGE_SIZE, (page_number - 1) * BROWSER_PAGE_SIZE)
     
-    st.subheader(f"Found {len(courses_df)} Courses")
+    # Prefetch details for the visible courses so opening one is instant
+    get_course_bundles(conn, [course.CourseID for course in courses])
     
     # Display courses
-    if len(courses_df) > 0:
-        for idx, course in courses_df.iterrows():
+    if courses:
+        for course in courses:
             with st.container():
                 col1, col2 = st.columns([4, 1])
                 
                 with col1:
                     if st.button(
-                        f"📖 {course['CourseCode']} - {course['CourseName']}",
-                        key=f"course_{course['CourseID']}"
+                        f"📖 {course.CourseCode} - {course.CourseName}",
+                        key=f"course_{course.CourseID}"
                     ):
-                        st.session_state.selected_course_id = course['CourseID']
+                        st.session_state.selected_course_id = course.CourseID
                         st.session_state.page = "course_details"
                         st.rerun()
                     
                     col_a, col_b, col_c, col_d = st.columns(4)
                     with col_a:
-                        st.caption(f"👥 Department: {course['DepartmentName']}")
+                        st.caption(f"👥 Department: {course.DepartmentName}")
                     with col_b:
-                        st.caption(f"⏱️ Credits: {course['CreditHours']}")
+                        st.caption(f"⏱️ Credits: {course.CreditHours}")
                     with col_c:
-                        st.caption(f"📊 Level: {course['DifficultyLevel']}")
+                        st.caption(f"📊 Level: {course.DifficultyLevel}")
                     with col_d:
-                        st.caption(f"🎯 Mode: {course['InstructionMode']}")
+                        st.caption(f"🎯 Mode: {course.InstructionMode}")
                     
-                    st.caption(course['Description'][:200] + "..." if len(str(course['Description'])) > 200 else course['Description'])
+                    st.caption(course.Description[:200] + "..." if len(str(course.Description)) > 200 else course.Description)
                 
                 with col2:
-                    enrollment_pct = (course['MaxEnrollment'] / 100) * 100 if course['MaxEnrollment'] else 0
-                    st.metric("Max Enrollment", course['MaxEnrollment'])
+                    enrollment_pct = (course.MaxEnrollment / 100) * 100 if course.MaxEnrollment else 0
+                    st.metric("Max Enrollment", course.MaxEnrollment)
                 
                 st.markdown("---")
+        
+        col_prev, col_page, col_next = st.columns([1, 4, 1])
+        with col_prev:
+            if st.button("← Previous", disabled=page_number <= 1, key="browser_prev"):
+                st.session_state.browser_page = page_number - 1
+                st.rerun()
+        with col_page:
+            st.caption(f"Page {page_number} of {page_count}")
+        with col_next:
+            if st.button("Next →", disabled=page_number >= page_count, key="browser_next"):
+                st.session_state.browser_page = page_number + 1
+                st.rerun()
     else:
         st.info("No courses found matching the selected filters.")
 
@@ -407,20 +718,19 @@ def page_course_browser():
 # PAGE: COURSE DETAILS
 # ============================================================================
 
-def page_course_details():
+def page_course_details(conn):
     """Display detailed information about a specific course"""
-    conn = get_db_connection()
-    
-    if "selected_course_id" not in st.session_state:
+    if st.session_state.get("selected_course_id") is None:
         st.warning("No course selected")
         return
     
     course_id = st.session_state.selected_course_id
-    course = get_course_details(conn, course_id)
+    bundle = get_course_bundle(conn, course_id)
     
-    if course is None:
+    if bundle is None:
         st.error("Course not found")
         return
+    course = bundle.course
     
     # Back button
     col1, col2 = st.columns([1, 5])
@@ -450,47 +760,48 @@ def page_course_details():
     st.write(course['Description'])
     
     # Learning Outcomes
-    if pd.notna(course['LearningOutcomes']) and course['LearningOutcomes']:
+    if course['LearningOutcomes']:
         st.subheader("🎯 Learning Outcomes")
         st.write(course['LearningOutcomes'])
     
     # Syllabus link
-    if pd.notna(course['SyllabusURL']) and course['SyllabusURL']:
+    if course['SyllabusURL']:
         st.subheader("📄 Course Syllabus")
         st.markdown(f"[Download Syllabus]({course['SyllabusURL']})")
     
     st.markdown("---")
     
     # Prerequisites
-    prerequisites = get_course_prerequisites(conn, course_id)
-    if not prerequisites.empty:
+    prerequisites = bundle.prerequisites
+    if prerequisites:
         st.subheader("📋 Prerequisites")
         
         # Organize by type
-        hard_prereqs = prerequisites[prerequisites['PrerequisiteType'] == 'Hard']
-        recommended = prerequisites[prerequisites['PrerequisiteType'] == 'Recommended']
-        coreqs = prerequisites[prerequisites['PrerequisiteType'] == 'Co-requisite']
+        hard_prereqs = [p for p in prerequisites if p['PrerequisiteType'] == 'Hard']
+        recommended = [p for p in prerequisites if p['PrerequisiteType'] == 'Recommended']
+        coreqs = [p for p in prerequisites if p['PrerequisiteType'] == 'Co-requisite']
         
-        if not hard_prereqs.empty:
+        if hard_prereqs:
             st.markdown("**Required Prerequisites:**")
-            for _, prereq in hard_prereqs.iterrows():
+            for prereq in hard_prereqs:
                 st.caption(f"• {prereq['PrerequisiteCourseCode']} - {prereq['PrerequisiteCourseName']} (Min Grade: {prereq['MinimumGrade']})")
         
-        if not recommended.empty:
+        if recommended:
             st.markdown("**Recommended Prerequisites:**")
-            for _, prereq in recommended.iterrows():
+            for prereq in recommended:
                 st.caption(f"• {prereq['PrerequisiteCourseCode']} - {prereq['PrerequisiteCourseName']}")
         
-        if not coreqs.empty:
+        if coreqs:
             st.markdown("**Co-requisites:**")
-            for _, prereq in coreqs.iterrows():
+            for prereq in coreqs:
                 st.caption(f"• {prereq['PrerequisiteCourseCode']} - {prereq['PrerequisiteCourseName']}")
     
     st.markdown("---")
     
     # Schedules
-    schedules = get_course_schedules(conn, course_id)
-    if not schedules.empty:
+    if bundle.schedules:
+        # DataFrame only for the table and charts
+        schedules = pd.DataFrame(bundle.schedules)
         st.subheader("📅 Available Schedules")
         
         # Display as table
@@ -508,35 +819,12 @@ def page_course_details():
         # Enrollment overview
         col1, col2 = st.columns(2)
         with col1:
-            status_counts = schedules['EnrollmentStatus'].value_counts()
-            fig = px.pie(
-                values=status_counts.values,
-                names=status_counts.index,
-                title='Schedule Enrollment Status',
-                color_discrete_map={
-                    'Open': '#2ecc71',
-                    'Full': '#e74c3c',
-                    'Closed': '#95a5a6',
-                    'Waitlist': '#f39c12'
-                }
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(enrollment_status_chart, schedules[['EnrollmentStatus']]),
+                            use_container_width=True)
         
         with col2:
-            total_enrolled = schedules['CurrentEnrollment'].sum()
-            total_capacity = schedules['MaxCapacity'].sum()
-            fig = go.Figure(data=[
-                go.Bar(name='Enrolled', x=['Total'], y=[total_enrolled]),
-                go.Bar(name='Available', x=['Total'], y=[total_capacity - total_enrolled])
-            ])
-            fig.update_layout(
-                title='Overall Enrollment',
-                barmode='stack',
-                height=400,
-                xaxis_title='',
-                yaxis_title='Students'
-            )
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(cached_figure(overall_enrollment_chart, schedules[['CurrentEnrollment', 'MaxCapacity']]),
+                            use_container_width=True)
     else:
         st.info("No schedules available for this course.")
 
@@ -544,42 +832,51 @@ def page_course_details():
 # PAGE: SEARCH
 # ============================================================================
 
-def page_search():
-    """Search courses by code or name"""
+def page_search(conn):
+    """Search courses by code, name, description or learning outcomes"""
     st.markdown("## 🔍 Course Search")
     st.markdown("---")
     
     search_term = st.text_input(
-        "Search by course code or name",
-        placeholder="e.g., 'BUS101' or 'Introduction to Business'"
+        "Search by course code, name or topic",
+        placeholder="e.g., 'FIN 3301', 'Introduction to Business' or 'portfolio risk'"
     )
     
     if search_term:
-        conn = get_db_connection()
         results = search_courses(conn, search_term)
         
-        st.subheader(f"Found {len(results)} Results")
+        total_results = count_search_results(conn, search_term) if len(results) >= SEARCH_RESULT_LIMIT else len(results)
+        if total_results > len(results):
+            st.subheader(f"Found {total_results} Results (showing the top {len(results)})")
+        else:
+            st.subheader(f"Found {total_results} Results")
+        get_course_bundles(conn, [course.CourseID for course in results])
         
         if len(results) > 0:
-            for idx, course in results.iterrows():
+            for course in results:
                 col1, col2 = st.columns([4, 1])
                 
                 with col1:
                     if st.button(
-                        f"📖 {course['CourseCode']} - {course['CourseName']}",
-                        key=f"search_course_{course['CourseID']}"
+                        f"📖 {course.CourseCode} - {course.CourseName}",
+                        key=f"search_course_{course.CourseID}"
                     ):
-                        st.session_state.selected_course_id = course['CourseID']
+                        st.session_state.selected_course_id = course.CourseID
                         st.session_state.page = "course_details"
                         st.rerun()
                     
                     col_a, col_b, col_c = st.columns(3)
                     with col_a:
-                        st.caption(f"👥 {course['DepartmentName']}")
+                        st.caption(f"👥 {course.DepartmentName}")
                     with col_b:
-                        st.caption(f"⏱️ {course['CreditHours']} Credits")
+                        st.caption(f"⏱️ {course.CreditHours} Credits")
                     with col_c:
-                        st.caption(f"📊 {course['DifficultyLevel']}")
+                        st.caption(f"📊 {course.DifficultyLevel}")
+                    
+                    # Description excerpt, shown when the match is in the description
+                    snippet = getattr(course, 'Snippet', None)
+                    if snippet and '**' in snippet:
+                        st.markdown(snippet)
                 
                 st.markdown("---")
         else:
@@ -591,124 +888,51 @@ def page_search():
 # PAGE: STATISTICS
 # ============================================================================
 
-def page_statistics():
+def page_statistics(conn):
     """Display database statistics"""
     st.markdown("## 📊 Course Statistics")
     st.markdown("---")
     
-    conn = get_db_connection()
-    
     # Overall statistics
-    query_stats = """
-    SELECT 
-        (SELECT COUNT(*) FROM Courses WHERE Status = 'Active') as total_courses,
-        (SELECT COUNT(DISTINCT DepartmentID) FROM Courses) as total_depts,
-        (SELECT COUNT(*) FROM Schedules) as total_schedules,
-        (SELECT COUNT(DISTINCT Semester) FROM Schedules) as semesters,
-        (SELECT AVG(CreditHours) FROM Courses WHERE Status = 'Active') as avg_credits,
-        (SELECT SUM(MaxCapacity) FROM Schedules) as total_capacity
-    """
-    stats = pd.read_sql_query(query_stats, conn)
-    stats = stats.iloc[0]
+    stats = get_statistics_overview(conn)
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Total Active Courses", int(stats['total_courses']))
+        st.metric("Total Active Courses", int(stats.total_courses))
     with col2:
-        st.metric("Total Departments", int(stats['total_depts']))
+        st.metric("Total Departments", int(stats.total_depts))
     with col3:
-        st.metric("Total Schedules", int(stats['total_schedules']))
+        st.metric("Total Schedules", int(stats.total_schedules))
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("Semesters Offered", int(stats['semesters']))
+        st.metric("Semesters Offered", int(stats.semesters))
     with col2:
-        st.metric("Avg Credit Hours", f"{stats['avg_credits']:.1f}")
+        st.metric("Avg Credit Hours", f"{stats.avg_credits:.1f}")
     with col3:
-        st.metric("Total Capacity", int(stats['total_capacity']))
+        st.metric("Total Capacity", int(stats.total_capacity))
     
     st.markdown("---")
     
     # Courses per department
-    dept_query = """
-    SELECT 
-        d.DepartmentName,
-        COUNT(c.CourseID) as CourseCount
-    FROM Departments d
-    LEFT JOIN Courses c ON d.DepartmentID = c.DepartmentID AND c.Status = 'Active'
-    WHERE d.IsActive = 1
-    GROUP BY d.DepartmentID, d.DepartmentName
-    ORDER BY CourseCount DESC
-    """
-    dept_data = pd.read_sql_query(dept_query, conn)
+    dept_data = get_department_distribution(conn)
     
     col1, col2 = st.columns(2)
     with col1:
-        fig = px.bar(
-            dept_data,
-            x='DepartmentName',
-            y='CourseCount',
-            title='Courses per Department',
-            labels={'DepartmentName': 'Department', 'CourseCount': 'Number of Courses'},
-            color='CourseCount',
-            color_continuous_scale='Blues'
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(department_chart, dept_data), use_container_width=True)
     
     # Credit hours distribution
     with col2:
-        credit_query = """
-        SELECT 
-            CreditHours,
-            COUNT(*) as CourseCount
-        FROM Courses
-        WHERE Status = 'Active'
-        GROUP BY CreditHours
-        ORDER BY CreditHours
-        """
-        credit_data = pd.read_sql_query(credit_query, conn)
-        
-        fig = px.bar(
-            credit_data,
-            x='CreditHours',
-            y='CourseCount',
-            title='Course Distribution by Credit Hours',
-            labels={'CreditHours': 'Credit Hours', 'CourseCount': 'Number of Courses'},
-            color='CourseCount',
-            color_continuous_scale='Greens'
-        )
-        fig.update_layout(height=400)
-        st.plotly_chart(fig, use_container_width=True)
+        credit_data = get_credit_hours_distribution(conn)
+        st.plotly_chart(cached_figure(credit_hours_chart, credit_data), use_container_width=True)
     
     st.markdown("---")
     
     # Enrollment by semester
-    semester_query = """
-    SELECT 
-        Semester,
-        SUM(CurrentEnrollment) as TotalEnrolled,
-        SUM(MaxCapacity) as TotalCapacity
-    FROM Schedules
-    GROUP BY Semester
-    ORDER BY Semester DESC
-    LIMIT 10
-    """
-    semester_data = pd.read_sql_query(semester_query, conn)
+    semester_data = get_semester_enrollment(conn)
     
     if not semester_data.empty:
-        fig = go.Figure(data=[
-            go.Bar(name='Enrolled', x=semester_data['Semester'], y=semester_data['TotalEnrolled']),
-            go.Bar(name='Capacity', x=semester_data['Semester'], y=semester_data['TotalCapacity'])
-        ])
-        fig.update_layout(
-            title='Enrollment by Semester',
-            barmode='group',
-            height=400,
-            xaxis_title='Semester',
-            yaxis_title='Number of Students'
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(cached_figure(semester_enrollment_chart, semester_data), use_container_width=True)
 
 # ============================================================================
 # MAIN APP
@@ -752,18 +976,25 @@ def main():
         
         st.markdown("---")
         st.caption(f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-    
-    # Main content
-    if st.session_state.page == "home":
-        page_home()
-    elif st.session_state.page == "course_browser":
-        page_course_browser()
-    elif st.session_state.page == "course_details":
-        page_course_details()
-    elif st.session_state.page == "search":
-        page_search()
-    elif st.session_state.page == "statistics":
-        page_statistics()
+        
+        cache_stats = get_query_cache().stats()
+        st.caption(f"Query cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+                   f"({cache_stats['hit_rate']:.0%}), {cache_stats['invalidations']} invalidations")
+        if st.button("🔄 Refresh data"):
+            get_query_cache().invalidate()
+    
+    # Main content, on one pooled connection for the whole rerun
+    with get_connection_pool().connection() as conn:
+        if st.session_state.page == "home":
+            page_home(conn)
+        elif st.session_state.page == "course_browser":
+            page_course_browser(conn)
+        elif st.session_state.page == "course_details":
+            page_course_details(conn)
+        elif st.session_state.page == "search":
+            page_search(conn)
+        elif st.session_state.page == "statistics":
+            page_statistics(conn)
 
 if __name__ == "__main__":
     main()